@@ -1,8 +1,89 @@
+import os
+import time
+from typing import List, Optional
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, cast, Numeric
+from sqlalchemy import exists, func, inspect, select, true
 from sqlalchemy.orm import aliased
 
-from models.sqlalchemy_models import NFHSStateData, NFHSDistrictData, State, District, Indicator
+from models.sqlalchemy_models import NFHSStateData, NFHSDistrictData, NFHSRound, State, District, Indicator
+from storage_backend import corr, numeric_value
+
+
+# ------------------------------
+# Data version
+# ------------------------------
+# Seconds a data version stamp is reused before the tables are probed again
+DATA_VERSION_TTL = float(os.environ.get("DATA_VERSION_TTL", 30))
+_data_version = (0.0, None)
+
+async def get_data_version(db: AsyncSession) -> str:
+    """Stamp of the fact tables' contents: newest round, row counts and highest data ids.
+
+    Loading, replacing or deleting rows changes it, so clients can key cached
+    figures by it and the reference caches here and in fastapi_server reload
+    when it moves (within DATA_VERSION_TTL seconds).
+    """
+    global _data_version
+    checked, version = _data_version
+    if version is None or time.monotonic() - checked >= DATA_VERSION_TTL:
+        row = (await db.execute(select(
+            select(func.max(NFHSStateData.nfhs_id)).scalar_subquery(),
+            select(func.count()).select_from(NFHSStateData).scalar_subquery(),
+            select(func.max(NFHSStateData.data_id)).scalar_subquery(),
+            select(func.count()).select_from(NFHSDistrictData).scalar_subquery(),
+            select(func.max(NFHSDistrictData.data_id)).scalar_subquery(),
+        ))).one()
+        version = "-".join(str(int(v or 0)) for v in row)
+        _data_version = (time.monotonic(), version)
+    return version
+
+
+# ------------------------------
+# Survey rounds
+# ------------------------------
+# (data version, ids of the rounds that have state data, ascending)
+ROUND_IDS = None
+
+async def get_round_ids(db: AsyncSession) -> List[int]:
+    global ROUND_IDS
+    version = await get_data_version(db)
+    if ROUND_IDS is None or ROUND_IDS[0] != version:
+        # One index probe per listed round instead of a DISTINCT over the fact table
+        result = await db.execute(
+            select(NFHSRound.nfhs_id)
+            .where(exists().where(NFHSStateData.nfhs_id == NFHSRound.nfhs_id))
+            .order_by(NFHSRound.nfhs_id.asc())
+        )
+        ROUND_IDS = (version, [int(r) for r in result.scalars().all()])
+    return ROUND_IDS[1]
+
+
+def selected_rounds(data) -> Optional[List[int]]:
+    """Rounds asked for in ``data.nfhs_ids``; None means each indicator's latest round."""
+    return sorted(set(data.nfhs_ids)) if data.nfhs_ids else None
+
+
+def latest_round(model):
+    """Correlated subquery: the newest round with data for the row's indicator.
+
+    Per indicator rather than globally, so indicators a partially loaded
+    round does not cover still show their previous round.
+    """
+    inner = aliased(inspect(model).mapper.class_)
+    return (
+        select(func.max(inner.nfhs_id))
+        .where(inner.indicator_id == model.indicator_id)
+        .scalar_subquery()
+    )
+
+
+def round_condition(model, rounds: Optional[List[int]]):
+    """Filter ``model`` (a fact table class or alias) to ``rounds``, or to each indicator's latest round."""
+    if rounds:
+        return model.nfhs_id.in_(rounds)
+    # Plain equality so the (indicator_id, nfhs_id) indexes stay usable
+    return model.nfhs_id == latest_round(model)
 
 
 # ------------------------------
@@ -22,6 +103,8 @@ async def compute_indicator_stats(data, db: AsyncSession):
         raise ValueError(f"Invalid category_type: {category_value}")
 
     column_name = column_mapping[category_value]
+    # Several rounds are pooled; the stored averages come from the latest of them
+    rounds = selected_rounds(data)
 
     # CASE 1: District-level (state is selected)
     if data.selected_state:
@@ -34,7 +117,9 @@ async def compute_indicator_stats(data, db: AsyncSession):
                 .join(NFHSDistrictData, NFHSDistrictData.district_id == District.district_id)
                 .where(
                     NFHSDistrictData.indicator_id == indicator_id,
-                    District.state_id == data.selected_state
+                    District.state_id == data.selected_state,
+                    round_condition(NFHSDistrictData, rounds),
+                    selected_category.isnot(None)
                 )
                 .order_by(selected_category.asc())
                 .limit(1)
@@ -48,7 +133,9 @@ async def compute_indicator_stats(data, db: AsyncSession):
                 .join(NFHSDistrictData, NFHSDistrictData.district_id == District.district_id)
                 .where(
                     NFHSDistrictData.indicator_id == indicator_id,
-                    District.state_id == data.selected_state
+                    District.state_id == data.selected_state,
+                    round_condition(NFHSDistrictData, rounds),
+                    selected_category.isnot(None)
                 )
                 .order_by(selected_category.desc())
                 .limit(1)
@@ -60,8 +147,16 @@ async def compute_indicator_stats(data, db: AsyncSession):
 
             # Build the query
             result_st_avg_total = (
-                                    select(NFHSDistrictData.st_avg_total)
-                                    .where(NFHSDistrictData.indicator_id == indicator_id)
+                                    select(numeric_value(NFHSDistrictData.st_avg_total))
+                                    .where(
+                                        NFHSDistrictData.indicator_id == indicator_id,
+                                        NFHSDistrictData.state_id == data.selected_state,
+                                        round_condition(NFHSDistrictData, rounds),
+                                        # Skip rows whose stored average is "NA"
+                                        numeric_value(NFHSDistrictData.st_avg_total).isnot(None)
+                                    )
+                                    .order_by(NFHSDistrictData.nfhs_id.desc())
+                                    .limit(1)
                                 )
 
             # Execute query
@@ -88,7 +183,11 @@ async def compute_indicator_stats(data, db: AsyncSession):
             min_stmt = (
                 select(State.state_name, selected_category)
                 .join(NFHSStateData, NFHSStateData.state_id == State.state_id)
-                .where(NFHSStateData.indicator_id == indicator_id)
+                .where(
+                    NFHSStateData.indicator_id == indicator_id,
+                    round_condition(NFHSStateData, rounds),
+                    selected_category.isnot(None)
+                )
                 .order_by(selected_category.asc())
                 .limit(1)
             )
@@ -99,7 +198,11 @@ async def compute_indicator_stats(data, db: AsyncSession):
             max_stmt = (
                 select(State.state_name, selected_category)
                 .join(NFHSStateData, NFHSStateData.state_id == State.state_id)
-                .where(NFHSStateData.indicator_id == indicator_id)
+                .where(
+                    NFHSStateData.indicator_id == indicator_id,
+                    round_condition(NFHSStateData, rounds),
+                    selected_category.isnot(None)
+                )
                 .order_by(selected_category.desc())
                 .limit(1)
             )
@@ -111,8 +214,15 @@ async def compute_indicator_stats(data, db: AsyncSession):
 
             # Build the query
             result_nat_avg_total = (
-                                    select(NFHSStateData.nat_avg_total)
-                                    .where(NFHSStateData.indicator_id == indicator_id)
+                                    select(numeric_value(NFHSStateData.nat_avg_total))
+                                    .where(
+                                        NFHSStateData.indicator_id == indicator_id,
+                                        round_condition(NFHSStateData, rounds),
+                                        # Skip rows whose stored average is "NA"
+                                        numeric_value(NFHSStateData.nat_avg_total).isnot(None)
+                                    )
+                                    .order_by(NFHSStateData.nfhs_id.desc())
+                                    .limit(1)
                                 )
 
             # Execute query
@@ -145,6 +255,10 @@ async def compute_indicator_correlations(data, db: AsyncSession):
     if not indicator_ids or len(indicator_ids) < 2:
         raise ValueError("At least 2 indicators required for correlation")
 
+    # With rounds given, pairs are matched within a round, so several rounds add
+    # observations; by default each indicator contributes its latest round
+    rounds = selected_rounds(data)
+
     # CASE 1: District-level
     if data.selected_state:
         for i, ind_x in enumerate(indicator_ids):
@@ -154,16 +268,18 @@ async def compute_indicator_correlations(data, db: AsyncSession):
 
                 corr_stmt = (
                     select(
-                        func.corr(
-                            cast(NFHSD1.total, Numeric),
-                            cast(NFHSD2.total, Numeric)
+                        corr(
+                            numeric_value(NFHSD1.total),
+                            numeric_value(NFHSD2.total)
                         )
                     )
-                    .join(NFHSD2, (NFHSD1.district_id == NFHSD2.district_id))
+                    .join(NFHSD2, (NFHSD1.district_id == NFHSD2.district_id) & (NFHSD1.nfhs_id == NFHSD2.nfhs_id if rounds else true()))
                     .join(District, District.district_id == NFHSD1.district_id)
                     .where(
                         NFHSD1.indicator_id == ind_x,
                         NFHSD2.indicator_id == ind_y,
+                        round_condition(NFHSD1, rounds),
+                        round_condition(NFHSD2, rounds),
                         District.state_id == data.selected_state
                     )
                 )
@@ -190,15 +306,17 @@ async def compute_indicator_correlations(data, db: AsyncSession):
 
                 corr_stmt = (
                     select(
-                        func.corr(
-                            cast(NFHS1.total, Numeric),
-                            cast(NFHS2.total, Numeric)
+                        corr(
+                            numeric_value(NFHS1.total),
+                            numeric_value(NFHS2.total)
                         )
                     )
-                    .join(NFHS2, (NFHS1.state_id == NFHS2.state_id))
+                    .join(NFHS2, (NFHS1.state_id == NFHS2.state_id) & (NFHS1.nfhs_id == NFHS2.nfhs_id if rounds else true()))
                     .where(
                         NFHS1.indicator_id == ind_x,
-                        NFHS2.indicator_id == ind_y
+                        NFHS2.indicator_id == ind_y,
+                        round_condition(NFHS1, rounds),
+                        round_condition(NFHS2, rounds)
                     )
                 )
                 result = (await db.execute(corr_stmt)).scalar()
@@ -0,0 +1,270 @@
+"""Latency and throughput benchmark for the FastAPI routes.
+
+    python -m src.data.synthetic_nfhs --database-url postgresql+asyncpg://.../bench --districts 5000 --reset
+    DATABASE_URL=postgresql+asyncpg://.../bench python -m benchmarks.bench_endpoints \\
+        --concurrency 1 4 16 --requests 200 --output benchmarks/results
+
+Requests go through httpx's ASGITransport straight into the app (no
+sockets), with the app lifespan running as in production. Ollama is
+replaced by benchmarks.ollama_stub and the summary cache points at a
+throwaway file. Each route is driven with random selections drawn from the
+seeded database. For every request the benchmark records latency and the
+number of SQL statements and DB time, from db_instrumentation.
+
+With --snapshot, a Parquet snapshot (src.data.parquet_snapshot) is loaded
+into a throwaway SQLite file and served from there instead of DATABASE_URL,
+so a benchmark environment is set up in seconds without a Postgres server.
+
+Results are written as JSON; pass --compare with an earlier file to print
+the p95 and throughput change per route and concurrency level.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+
+from benchmarks.ollama_stub import OllamaStub
+from db_instrumentation import track_queries
+
+ROUTES = [
+    "/receiveCategories",
+    "/getStatesByIndicators",
+    "/getDistrictsByIndicators",
+    "/indicator-stats",
+    "/indicator-correlation",
+    "/indicator-summary",
+]
+# Weighted toward Total, the dashboard default
+CATEGORY_TYPES = ["Total", "Total", "ST", "Non-ST"]
+
+
+class SelectionMix:
+    """Random but reproducible request payloads for each route."""
+
+    def __init__(self, category_indicators, state_ids, seed=0, max_indicators=4):
+        self.category_indicators = {k: [i["indicator_id"] for i in v] for k, v in category_indicators.items() if v}
+        self.state_ids = state_ids
+        self.max_indicators = max_indicators
+        self.rng = random.Random(seed)
+
+    def payload(self, route):
+        rng = self.rng
+        category_id = rng.choice(list(self.category_indicators))
+        if route == "/receiveCategories":
+            return {"selected_value": int(category_id)}
+
+        ids = self.category_indicators[category_id]
+        indicators = rng.sample(ids, k=min(len(ids), rng.randint(1, self.max_indicators)))
+
+        # District views need a state; the analysis routes see both levels
+        state = None
+        if route == "/getDistrictsByIndicators" or (route != "/getStatesByIndicators" and rng.random() < 0.5):
+            state = rng.choice(self.state_ids)
+
+        return {"selected_indicators": indicators, "category_type": rng.choice(CATEGORY_TYPES),
+                "selected_state": state}
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def run_level(client, route, mix, concurrency, requests):
+    payloads = iter([mix.payload(route) for _ in range(requests)])
+    latencies, queries, db_ms = [], [], []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        for payload in payloads:
+            started = time.perf_counter()
+            with track_queries() as stats:
+                try:
+                    response = await client.post(route, json=payload)
+                    ok = response.status_code < 400
+                except Exception:
+                    ok = False
+            elapsed = time.perf_counter() - started
+
+            if ok:
+                latencies.append(elapsed * 1000)
+                queries.append(stats.statements)
+                db_ms.append(stats.db_time * 1000)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "route": route,
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "requests_per_second": round(len(latencies) / wall, 2) if wall else None,
+        "latency_ms": {
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "mean": statistics.fmean(latencies) if latencies else None,
+            "max": latencies[-1] if latencies else None,
+        },
+        "queries_per_request": {
+            "mean": statistics.fmean(queries) if queries else None,
+            "max": max(queries) if queries else None,
+        },
+        "db_ms_per_request": statistics.fmean(db_ms) if db_ms else None,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results, previous=None):
+    baseline = {(r["route"], r["concurrency"]): r for r in (previous or {}).get("results", [])}
+    print(f"{'route':<28}{'conc':>5}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'q/req':>7}{'err':>5}")
+    for r in results:
+        lat = r["latency_ms"]
+        fmt = lambda v: f"{v:9.1f}" if v is not None else f"{'-':>9}"
+        line = (f"{r['route']:<28}{r['concurrency']:>5}{fmt(r['requests_per_second'])}"
+                f"{fmt(lat['p50'])}{fmt(lat['p95'])}{fmt(lat['p99'])}"
+                f"{r['queries_per_request']['mean'] or 0:7.1f}{r['errors']:>5}")
+        before = baseline.get((r["route"], r["concurrency"]))
+        if before and before["latency_ms"]["p95"] and lat["p95"] and before["requests_per_second"]:
+            line += (f"   p95 {100 * (lat['p95'] / before['latency_ms']['p95'] - 1):+.0f}%"
+                     f"  rps {100 * (r['requests_per_second'] / before['requests_per_second'] - 1):+.0f}%")
+        print(line)
+
+
+async def check_district_coverage(client, fastapi_server, category_indicators, state_ids):
+    """Fail early when the district route drops the seeded districts, e.g. ids in cluster_district_ids.json."""
+    from sqlalchemy import select
+    from models.sqlalchemy_models import NFHSDistrictData
+
+    indicator_id = next(iter(category_indicators.values()))[0]["indicator_id"]
+    for state_id in state_ids[:3]:
+        async with fastapi_server.async_session() as db:
+            seeded = {int(d) for d in (await db.execute(
+                select(NFHSDistrictData.district_id).distinct()
+                .where(NFHSDistrictData.state_id == state_id, NFHSDistrictData.indicator_id == indicator_id)
+            )).scalars()}
+        response = await client.post("/getDistrictsByIndicators", json={
+            "selected_indicators": [indicator_id], "category_type": "Total", "selected_state": state_id})
+        response.raise_for_status()
+        returned = {row["district_id"] for row in response.json()["indicator_data"][0]["data"]}
+        expected = seeded - fastapi_server.BLOCKED_DISTRICT_IDS
+        if seeded and not expected:
+            raise SystemExit(f"Every district of state {state_id} is in cluster_district_ids.json; "
+                             "reseed with the current src.data.synthetic_nfhs")
+        if returned != expected:
+            raise SystemExit(f"/getDistrictsByIndicators returned {len(returned)} of the "
+                             f"{len(expected)} districts of state {state_id}")
+
+
+async def bench(args):
+    # Imported here so the environment set in main() is in place before module-level config is read
+    import httpx
+    import fastapi_server
+    from sqlalchemy.engine import make_url
+
+    app = fastapi_server.app
+
+    results = []
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+            category_indicators = (await client.get("/categoryIndicators")).json()["category_indicators"]
+            state_ids = [int(s["state_id"]) for s in (await client.get("/States")).json()]
+            if not category_indicators or not state_ids:
+                raise SystemExit("Database has no indicators or states; seed it with src.data.synthetic_nfhs")
+            await check_district_coverage(client, fastapi_server, category_indicators, state_ids)
+
+            for route in args.routes:
+                mix = SelectionMix(category_indicators, state_ids, seed=args.seed)
+                if args.warmup:
+                    await run_level(client, route, mix, 1, args.warmup)
+                for concurrency in args.concurrency:
+                    result = await run_level(client, route, mix, concurrency, args.requests)
+                    results.append(result)
+                    print(f"  {route} x{concurrency}: {result['requests_per_second']} req/s")
+
+    return {
+        "run": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": make_url(fastapi_server.DATABASE_URL).render_as_string(hide_password=True),
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "token_delay": args.token_delay,
+        },
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the FastAPI routes against a seeded database")
+    parser.add_argument("--routes", nargs="+", default=ROUTES, choices=ROUTES)
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=100, help="requests per route and concurrency level")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--token-delay", type=float, default=0.0, help="stub Ollama delay between tokens")
+    parser.add_argument("--output", default=os.path.join("benchmarks", "results"),
+                        help="directory or .json file for the results")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--snapshot", help="Parquet snapshot directory to serve from an embedded SQLite file")
+    args = parser.parse_args()
+
+    stub = OllamaStub(token_delay=args.token_delay).start()
+    os.environ["OLLAMA_URL"] = stub.url
+    os.environ.setdefault("SQL_ECHO", "0")
+    scratch = tempfile.mkdtemp(prefix="bench-")
+    os.environ["SUMMARY_CACHE_PATH"] = os.path.join(scratch, "summary_cache.sqlite3")
+    if args.snapshot:
+        from src.data.parquet_snapshot import import_snapshot
+
+        database_url = "sqlite+aiosqlite:///" + os.path.join(scratch, "nfhs.sqlite3")
+        asyncio.run(import_snapshot(database_url, args.snapshot))
+        os.environ["DATABASE_URL"] = database_url
+
+    try:
+        report = asyncio.run(bench(args))
+    finally:
+        stub.stop()
+
+    output = args.output
+    if not output.endswith(".json"):
+        os.makedirs(output, exist_ok=True)
+        output = os.path.join(output, f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    previous = None
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+    print_results(report["results"], previous)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
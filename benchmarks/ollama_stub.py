@@ -0,0 +1,99 @@
+"""Minimal stand-in for the Ollama HTTP API, for benchmarks.
+
+    python -m benchmarks.ollama_stub --port 11434 --token-delay 0.01
+
+Answers POST /api/generate with a canned streamed (NDJSON) or single JSON
+response, so benchmarks measure the API rather than the model.
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CANNED_SUMMARY = (
+    "The selected indicators show significant regional disparities across states. "
+    "Performance gaps between the highest and lowest performing regions exceed twenty percentage points. "
+    "Tribal districts consistently trail the national average on maternal and child health coverage. "
+    "Targeted outreach through Anganwadi centres and ASHA workers could narrow these gaps. "
+    "State-level variations suggest that programme implementation, not only resources, drives outcomes."
+)
+
+
+class OllamaStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.0"  # body ends when the connection closes
+    tokens = CANNED_SUMMARY.split(" ")
+    token_delay = 0.0
+
+    def do_POST(self):
+        if self.path != "/api/generate":
+            self.send_error(404)
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        model = body.get("model", "stub")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+
+        if not body.get("stream", True):
+            time.sleep(self.token_delay * len(self.tokens))
+            self.wfile.write(json.dumps({"model": model, "response": CANNED_SUMMARY, "done": True}).encode())
+            return
+
+        for i, token in enumerate(self.tokens):
+            if self.token_delay:
+                time.sleep(self.token_delay)
+            fragment = token if i == 0 else " " + token
+            self.wfile.write((json.dumps({"model": model, "response": fragment, "done": False}) + "\n").encode())
+            self.wfile.flush()
+        self.wfile.write((json.dumps({"model": model, "response": "", "done": True,
+                                      "eval_count": len(self.tokens)}) + "\n").encode())
+
+    def log_message(self, format, *args):
+        pass
+
+
+class OllamaStub:
+    """Run the stub server on a background thread."""
+
+    def __init__(self, host="127.0.0.1", port=0, token_delay=0.0):
+        handler = type("Handler", (OllamaStubHandler,), {"token_delay": token_delay})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a fake Ollama /api/generate")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--token-delay", type=float, default=0.0, help="seconds between streamed tokens")
+    args = parser.parse_args()
+
+    stub = OllamaStub(args.host, args.port, args.token_delay)
+    print(f"Ollama stub listening on {stub.url}")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
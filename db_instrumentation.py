@@ -0,0 +1,146 @@
+"""Per-request SQL statement counting, timing and N+1 detection.
+
+Engine events record every statement against the ``QueryStats`` active in
+the current context. QueryTimingMiddleware opens one per request and
+reports it in a ``Server-Timing`` header and in debug logs. Scripts and
+checks can wrap calls in ``track_queries()`` or ``query_budget(n)``.
+"""
+import logging
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+from metrics import DB_STATEMENTS, DB_TIME, route_template
+
+logger = logging.getLogger(__name__)
+
+# The same statement this many times in one request is reported as a likely N+1
+N_PLUS_ONE_THRESHOLD = int(os.environ.get("N_PLUS_ONE_THRESHOLD", 5))
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised by query_budget when a block runs more statements than allowed."""
+
+
+class QueryStats:
+    """Statements, DB time and rows for one request or block; totals also roll up into ``parent``."""
+
+    def __init__(self, parent: Optional["QueryStats"] = None):
+        self.parent = parent
+        self.statements = 0
+        self.db_time = 0.0
+        self.rows = 0
+        self.by_statement = Counter()
+
+    def record(self, statement: str, duration: float, rows: int):
+        self.statements += 1
+        self.db_time += duration
+        self.rows += rows
+        self.by_statement[statement] += 1
+        if self.parent is not None:
+            self.parent.record(statement, duration, rows)
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD):
+        """Statements executed at least ``threshold`` times: the N+1 suspects."""
+        return [(sql, n) for sql, n in self.by_statement.most_common() if n >= threshold]
+
+    def to_dict(self):
+        return {"statements": self.statements, "db_ms": round(self.db_time * 1000, 2), "rows": self.rows}
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("db_query_stats", default=None)
+
+
+def instrument_engine(engine):
+    """Attach the counting listeners to an (async) engine's sync core."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_start"].pop()
+        stats = _current_stats.get()
+        if stats is None:
+            return
+        rows = cursor.rowcount if cursor.rowcount and cursor.rowcount > 0 else 0
+        # asyncpg's adapted cursor buffers SELECT results and reports no rowcount
+        if not rows and cursor.description is not None:
+            rows = len(getattr(cursor, "_rows", ()) or ())
+        stats.record(statement, time.perf_counter() - started, rows)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(context):
+        # A failed statement never reaches after_cursor_execute; drop its start time
+        conn = context.connection
+        if conn is not None and context.cursor is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
+
+
+@contextmanager
+def track_queries():
+    """Collect QueryStats for the enclosed block (nested blocks roll up)."""
+    stats = QueryStats(parent=_current_stats.get())
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@contextmanager
+def query_budget(max_statements: int, label: str = "block"):
+    """Fail with QueryBudgetExceeded when the block runs more than ``max_statements`` statements.
+
+        with query_budget(4, "/indicator-stats"):
+            await client.post("/indicator-stats", json=selection)
+    """
+    with track_queries() as stats:
+        yield stats
+    if stats.statements > max_statements:
+        repeated = ", ".join(f"{n}x {sql.split()[0]}..." for sql, n in stats.repeated(2)[:3])
+        raise QueryBudgetExceeded(
+            f"{label} ran {stats.statements} statements (budget {max_statements})"
+            + (f"; repeated: {repeated}" if repeated else "")
+        )
+
+
+class QueryTimingMiddleware:
+    """ASGI middleware adding ``Server-Timing: db;dur=..., app;dur=...`` to every HTTP response."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        with track_queries() as stats:
+            async def send_with_timing(message):
+                if message["type"] == "http.response.start":
+                    elapsed = (time.perf_counter() - started) * 1000
+                    timing = (f'db;dur={stats.db_time * 1000:.1f};desc="{stats.statements} queries, '
+                              f'{stats.rows} rows", app;dur={elapsed:.1f}')
+                    message["headers"] = list(message.get("headers", [])) + [(b"server-timing", timing.encode("latin-1"))]
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
+
+        route = route_template(scope)
+        DB_TIME.observe(stats.db_time, route=route)
+        DB_STATEMENTS.observe(stats.statements, route=route)
+
+        path = scope.get("path")
+        logger.debug("%s %s: %d statements, %.1f ms DB, %d rows", scope.get("method"), path,
+                     stats.statements, stats.db_time * 1000, stats.rows)
+        for sql, n in stats.repeated():
+            logger.warning("Possible N+1 on %s: statement ran %d times: %s", path, n, " ".join(sql.split())[:200])
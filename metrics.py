@@ -0,0 +1,278 @@
+"""Minimal Prometheus metrics for the API and the Dash server.
+
+Metrics live in process memory and are rendered in the Prometheus text
+format by ``registry.render()``; both apps serve it on ``/metrics``. Under
+gunicorn every worker has its own registry, so scrape workers individually
+(or run a single worker) when exact totals matter.
+"""
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Seconds; covers fast reference lookups up to multi-minute LLM generations
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labelnames: Sequence[str], values: Sequence, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple:
+        return tuple(labels.get(name, "") for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [f"{self.name}{_labels(self.labelnames, k)} {_number(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._values[key] = (counts, total + value)
+
+    def time(self, **labels):
+        """Context manager observing the elapsed seconds of its block."""
+        histogram = self
+
+        class _Timer:
+            def __enter__(self):
+                self.started = time.perf_counter()
+                return self
+
+            def __exit__(self, *exc):
+                histogram.observe(time.perf_counter() - self.started, **labels)
+
+        return _Timer()
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(k, (list(counts), total)) for k, (counts, total) in self._values.items()]
+        lines = self.header()
+        for key, (counts, total) in items:
+            for bound, count in zip(self.buckets, counts):
+                le = 'le="%s"' % _number(bound)
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {count}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {counts[-1]}")
+        return lines
+
+
+# A collector returns (name, kind, help, [(labels, value), ...]) tuples, read at scrape time
+Collector = Callable[[], Iterable[Tuple[str, str, str, List[Tuple[Dict, float]]]]]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Collector] = []
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self._add(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()) -> Gauge:
+        return self._add(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, documentation, labelnames, buckets))
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Collector):
+        self._collectors.append(collector)
+
+    def register_cache(self, cache_name: str, stats: Callable[[], Dict]):
+        """Expose a cache's ``stats()`` dict (hits, misses, hit_ratio, entries)."""
+        def collect():
+            current = stats()
+            labels = {"cache": cache_name}
+            yield "td_cache_hits_total", "counter", "Cache hits", [(labels, current.get("hits", 0))]
+            yield "td_cache_misses_total", "counter", "Cache misses", [(labels, current.get("misses", 0))]
+            yield "td_cache_hit_ratio", "gauge", "Cache hit ratio since start", [(labels, current.get("hit_ratio", 0.0))]
+            yield "td_cache_entries", "gauge", "Entries currently cached", [(labels, current.get("entries", 0))]
+        self.register_collector(collect)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+
+        # Collected families may repeat across collectors (e.g. one per cache); merge them
+        families: Dict[str, Tuple[str, str, List]] = {}
+        for collector in self._collectors:
+            try:
+                for name, kind, documentation, samples in collector():
+                    families.setdefault(name, (kind, documentation, []))[2].extend(samples)
+            except Exception as e:
+                lines.append(f"# collector failed: {_escape(e)}")
+        for name, (kind, documentation, samples) in families.items():
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{_labels(list(labels), list(labels.values()))} {_number(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+registry = Registry()
+
+# === HTTP ===
+REQUEST_LATENCY = registry.histogram(
+    "td_http_request_duration_seconds", "Request latency by route", ("app", "method", "route", "status"))
+REQUESTS_IN_FLIGHT = registry.gauge("td_http_requests_in_flight", "Requests currently being served", ("app",))
+
+# === Database ===
+DB_CONNECT_TIME = registry.histogram(
+    "td_db_connect_seconds", "Time to open a new DB connection for the pool",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5, 30))
+DB_POOL_CHECKOUTS = registry.counter("td_db_pool_checkouts_total", "Connections checked out of the pool")
+DB_POOL_WAIT = registry.histogram(
+    "td_db_pool_checkout_wait_seconds", "Time a request waited for a pooled DB connection",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5, 30))
+DB_TIME = registry.histogram("td_db_time_seconds", "DB time per request by route", ("route",))
+DB_STATEMENTS = registry.histogram(
+    "td_db_statements_per_request", "SQL statements per request by route", ("route",),
+    buckets=(1, 2, 5, 10, 20, 50, 100, 250))
+
+# === LLM ===
+LLM_GENERATION_LATENCY = registry.histogram(
+    "td_llm_generation_seconds", "Wall time of one LLM generation", ("backend", "model"))
+LLM_TOKENS_PER_SECOND = registry.histogram(
+    "td_llm_tokens_per_second", "Generation speed reported by the LLM server", ("backend", "model"),
+    buckets=(1, 2, 5, 10, 20, 40, 80, 160))
+LLM_TOKENS = registry.counter("td_llm_generated_tokens_total", "Tokens generated", ("backend", "model"))
+
+
+def instrument_pool(engine):
+    """Pool metrics from the engine's pool events; the gauges read the current pool at scrape time.
+
+    Listeners sit on the engine, so they carry over to the new pool that
+    ``dispose()`` (called before gunicorn forks) puts in place. The wait
+    for a connection is timed where it is acquired (``get_session``) and
+    recorded in DB_POOL_WAIT.
+    """
+    from sqlalchemy import event  # the Dash server uses this module without SQLAlchemy
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "do_connect")
+    def _connecting(dialect, connection_record, cargs, cparams):
+        connection_record.info["connect_started"] = time.perf_counter()
+
+    @event.listens_for(sync_engine, "connect")
+    def _connected(dbapi_connection, connection_record):
+        started = connection_record.info.pop("connect_started", None)
+        if started is not None:
+            DB_CONNECT_TIME.observe(time.perf_counter() - started)
+
+    @event.listens_for(sync_engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKOUTS.inc()
+
+    def collect():
+        pool = sync_engine.pool
+        # NullPool and StaticPool (SQLite) keep no counts
+        if not hasattr(pool, "checkedout"):
+            return
+        yield "td_db_pool_checked_out", "gauge", "Connections checked out of the pool", [({}, pool.checkedout())]
+        yield "td_db_pool_size", "gauge", "Configured pool size", [({}, pool.size())]
+        yield "td_db_pool_overflow", "gauge", "Connections open beyond the pool size", [({}, max(0, pool.overflow()))]
+    registry.register_collector(collect)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route latency and in-flight requests."""
+
+    def __init__(self, app, app_name: str = "api"):
+        self.app = app
+        self.app_name = app_name
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc(app=self.app_name)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUESTS_IN_FLIGHT.dec(app=self.app_name)
+            REQUEST_LATENCY.observe(time.perf_counter() - started, app=self.app_name,
+                                    method=scope.get("method"), route=route_template(scope),
+                                    status=status["code"])
+
+
+def route_template(scope) -> str:
+    """Matched route path (``/indicator-summary/jobs/{job_id}``) to keep label cardinality bounded."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
@@ -16,6 +16,7 @@ class IndicatorSelection(BaseModel):
     selected_indicators: List[int]
     category_type: str
     selected_state: Optional[int] = None
+    nfhs_ids: Optional[List[int]] = None  # survey rounds; None means the latest round
 
 class IndicatorTypeOut(BaseModel):
     indicator_id: float  # or int if you're not using decimal
@@ -0,0 +1,151 @@
+"""Production launcher for the FastAPI backend and the Dash dashboard.
+
+    python serve.py api  [--workers N] [--bind 0.0.0.0:8000]
+    python serve.py dash [--workers N] [--bind 0.0.0.0:8050]
+    python serve.py all
+
+Both apps run under gunicorn with the app preloaded in the master, so the
+GeoJSON files and reference data are loaded once and shared copy-on-write
+with the forked workers. Send SIGHUP to the master for a graceful reload.
+Every option can also be set through the TD_* environment variables.
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+
+import requests
+from gunicorn.app.base import BaseApplication
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+class StandaloneApplication(BaseApplication):
+    """Run a preloaded WSGI/ASGI app under gunicorn without a config file."""
+
+    def __init__(self, loader, options):
+        self.loader = loader
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key, value)
+
+    def load(self):
+        return self.loader()
+
+
+# === App loaders (run once in the master when preloading) ===
+def load_api():
+    import fastapi_server
+
+    async def preload():
+        try:
+            await fastapi_server.warm_reference_caches()
+        except Exception as e:
+            logger.warning("Reference cache warm-up skipped: %s", e)
+        # Never hand open connections to forked workers
+        await fastapi_server.engine.dispose()
+
+    asyncio.run(preload())
+    return fastapi_server.app
+
+
+def load_dash():
+    from src.components.layout import BASE_URL, create_layout
+
+    # The layout is built from API data, so wait for the backend to come up
+    deadline = time.monotonic() + _env_int("TD_API_WAIT", 60)
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(BASE_URL + "/readyz", timeout=2).status_code == 200:
+                break
+        except requests.RequestException:
+            pass
+        time.sleep(1)
+
+    return create_layout().server
+
+
+# === Gunicorn options ===
+def api_options(args):
+    cores = multiprocessing.cpu_count()
+    return {
+        "bind": args.bind or os.environ.get("TD_API_BIND", "0.0.0.0:8000"),
+        "workers": args.workers or _env_int("TD_API_WORKERS", cores),
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": True,
+        # Async workers keep heart-beating during long LLM calls
+        "timeout": _env_int("TD_API_TIMEOUT", 120),
+        "graceful_timeout": _env_int("TD_GRACEFUL_TIMEOUT", 30),
+        "keepalive": 5,
+        "max_requests": _env_int("TD_MAX_REQUESTS", 10000),
+        "max_requests_jitter": _env_int("TD_MAX_REQUESTS_JITTER", 1000),
+        "accesslog": "-",
+    }
+
+
+def dash_options(args):
+    cores = multiprocessing.cpu_count()
+    return {
+        "bind": args.bind or os.environ.get("TD_DASH_BIND", "0.0.0.0:8050"),
+        "workers": args.workers or _env_int("TD_DASH_WORKERS", cores),
+        # Callbacks block on backend HTTP calls, so give each worker threads
+        "worker_class": "gthread",
+        "threads": args.threads or _env_int("TD_DASH_THREADS", 4),
+        "preload_app": True,
+        "timeout": _env_int("TD_DASH_TIMEOUT", 360),
+        "graceful_timeout": _env_int("TD_GRACEFUL_TIMEOUT", 30),
+        "keepalive": 5,
+        "max_requests": _env_int("TD_MAX_REQUESTS", 10000),
+        "max_requests_jitter": _env_int("TD_MAX_REQUESTS_JITTER", 1000),
+        "accesslog": "-",
+    }
+
+
+def run_api(args):
+    # SQL echo logs every statement; keep it off in production
+    os.environ.setdefault("SQL_ECHO", "0")
+    StandaloneApplication(load_api, api_options(args)).run()
+
+
+def run_dash(args):
+    StandaloneApplication(load_dash, dash_options(args)).run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Tribal Health Dashboard in production mode")
+    parser.add_argument("target", choices=["api", "dash", "all"])
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU cores)")
+    parser.add_argument("--threads", type=int, help="threads per Dash worker")
+    parser.add_argument("--bind", help="host:port to bind (ignored for 'all')")
+    args = parser.parse_args()
+
+    if args.target == "api":
+        run_api(args)
+    elif args.target == "dash":
+        run_dash(args)
+    else:
+        args.bind = None
+        api = multiprocessing.Process(target=run_api, args=(args,), name="td-api")
+        dash = multiprocessing.Process(target=run_dash, args=(args,), name="td-dash")
+        api.start()
+        dash.start()
+        try:
+            api.join()
+            dash.join()
+        except KeyboardInterrupt:
+            api.terminate()
+            dash.terminate()
+
+
+if __name__ == "__main__":
+    main()
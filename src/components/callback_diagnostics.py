@@ -0,0 +1,189 @@
+"""Timing and size diagnostics for the Dash callbacks.
+
+``instrument_callbacks(app)`` wraps every callback registered afterwards and
+records wall time, time spent in backend HTTP calls (made through
+``TimedSession``), serialised response size and the triggering input. The
+aggregates are served as JSON on ``/_diagnostics/callbacks`` and as
+histograms on ``/metrics``.
+"""
+import functools
+import threading
+import time
+from collections import Counter
+
+import flask
+import requests
+from dash import Output, callback_context
+
+from metrics import registry
+
+CALLBACK_LATENCY = registry.histogram(
+    "td_dash_callback_seconds", "Dash callback wall time", ("callback",))
+CALLBACK_BACKEND_WAIT = registry.histogram(
+    "td_dash_callback_backend_wait_seconds", "Time a Dash callback spent waiting on the API", ("callback",))
+CALLBACK_OUTPUT_BYTES = registry.histogram(
+    "td_dash_callback_output_bytes", "Serialised callback response size", ("callback",),
+    buckets=(1e3, 1e4, 5e4, 1e5, 5e5, 1e6, 5e6, 2e7))
+
+# Same callback fired again with identical inputs within this window counts as a redundant refresh
+REPEAT_WINDOW = 2.0
+
+_local = threading.local()
+
+
+class TimedSession(requests.Session):
+    """requests.Session that adds time spent on backend calls to the running callback's tally.
+
+    Also keeps connections to the API alive across callbacks.
+    """
+
+    def request(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().request(*args, **kwargs)
+        finally:
+            if getattr(_local, "backend_wait", None) is not None:
+                _local.backend_wait += time.perf_counter() - started
+
+
+class CallbackStats:
+    """In-memory aggregate per callback: time, backend wait, output size and triggers."""
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.backend_wait = 0.0
+        self.output_bytes = 0
+        self.max_output_bytes = 0
+        self.repeats = 0
+        self.triggers = Counter()
+        self.last_inputs = None
+        self.last_called = 0.0
+        self.slowest = []
+
+    def to_dict(self):
+        calls = self.calls or 1
+        return {
+            "callback": self.name,
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_ms": round(self.total_time * 1000, 1),
+            "mean_ms": round(self.total_time * 1000 / calls, 1),
+            "max_ms": round(self.max_time * 1000, 1),
+            "backend_wait_ms": round(self.backend_wait * 1000, 1),
+            "backend_share": round(self.backend_wait / self.total_time, 3) if self.total_time else 0.0,
+            "mean_output_bytes": round(self.output_bytes / calls),
+            "max_output_bytes": self.max_output_bytes,
+            "redundant_calls": self.repeats,
+            "triggers": dict(self.triggers.most_common()),
+            "slowest": list(self.slowest),
+        }
+
+
+class CallbackDiagnostics:
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def stats_for(self, name):
+        with self._lock:
+            if name not in self._stats:
+                self._stats[name] = CallbackStats(name)
+            return self._stats[name]
+
+    def record_call(self, name, elapsed, backend_wait, trigger, inputs_key, failed):
+        stats = self.stats_for(name)
+        now = time.time()
+        with self._lock:
+            stats.calls += 1
+            stats.errors += int(failed)
+            stats.total_time += elapsed
+            stats.max_time = max(stats.max_time, elapsed)
+            stats.backend_wait += backend_wait
+            stats.triggers[trigger] += 1
+            if inputs_key == stats.last_inputs and now - stats.last_called < REPEAT_WINDOW:
+                stats.repeats += 1
+            stats.last_inputs, stats.last_called = inputs_key, now
+            stats.slowest.append({"ms": round(elapsed * 1000, 1), "trigger": trigger,
+                                  "backend_wait_ms": round(backend_wait * 1000, 1)})
+            stats.slowest = sorted(stats.slowest, key=lambda s: s["ms"], reverse=True)[:5]
+        CALLBACK_LATENCY.observe(elapsed, callback=name)
+        CALLBACK_BACKEND_WAIT.observe(backend_wait, callback=name)
+
+    def record_output(self, name, size):
+        stats = self.stats_for(name)
+        with self._lock:
+            stats.output_bytes += size
+            stats.max_output_bytes = max(stats.max_output_bytes, size)
+        CALLBACK_OUTPUT_BYTES.observe(size, callback=name)
+
+    def report(self):
+        with self._lock:
+            rows = [stats.to_dict() for stats in self._stats.values()]
+        return sorted(rows, key=lambda r: r["total_ms"], reverse=True)
+
+
+diagnostics = CallbackDiagnostics()
+
+
+def callback_name(args, kwargs):
+    """Name a callback by its Output(s): unique per app, unlike function names (several are lambdas)."""
+    outputs = []
+    for dependency in list(args) + [kwargs.get("output")]:
+        for item in dependency if isinstance(dependency, (list, tuple)) else [dependency]:
+            if isinstance(item, Output):
+                outputs.append(str(item))
+    return ",".join(outputs) or None
+
+
+def timed_callback(func, name=None):
+    # Without outputs to go by, fall back to where the function is defined
+    name = name or f"{func.__name__}:{func.__code__.co_firstlineno}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        _local.backend_wait = 0.0
+        started = time.perf_counter()
+        failed = False
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            backend_wait, _local.backend_wait = _local.backend_wait, None
+            triggered = callback_context.triggered
+            trigger = triggered[0]["prop_id"] if triggered else "initial"
+            diagnostics.record_call(name, elapsed, backend_wait, trigger, hash(repr(args)), failed)
+            if flask.has_request_context():
+                flask.g.dash_callback = name
+
+    return wrapper
+
+
+def instrument_callbacks(app):
+    """Wrap every callback registered through ``app.callback`` and serve ``/_diagnostics/callbacks``."""
+    register_callback = app.callback
+
+    @functools.wraps(register_callback)
+    def callback(*args, **kwargs):
+        register = register_callback(*args, **kwargs)
+        name = callback_name(args, kwargs)
+        return lambda func: register(timed_callback(func, name))
+
+    app.callback = callback
+
+    @app.server.after_request
+    def record_output_size(response):
+        name = flask.g.pop("dash_callback", None)
+        if name is not None and not response.direct_passthrough:
+            diagnostics.record_output(name, response.calculate_content_length() or len(response.get_data()))
+        return response
+
+    @app.server.route("/_diagnostics/callbacks")
+    def callback_report():
+        return flask.jsonify(diagnostics.report())
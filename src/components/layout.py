@@ -1,8 +1,9 @@
-import dash, json
+import dash, json, logging, os, time
+import flask
 import requests
 import dash_bootstrap_components as dbc
 from dash import ctx, html, Output, Input, dcc, State, ALL, dash_table
-from src.data.fetch_data import fetch_states, fetch_categories
+from src.data.fetch_data import fetch_states, fetch_categories, fetch_category_indicators
 from src.components.dropdowns.state_dropdown import StateDropdown
 from src.components.dropdowns.category_dropdown import CategoryDropdown
 from src.components.dropdowns.indicator_dropdown import IndicatorDropdown
@@ -11,8 +12,78 @@ from src.components.plots.violin_chart import ViolinChartComponent
 from src.data.map_helper import filter_geojson_by_district_ids, compute_geojson_center
 from src.components.plots.map_chart import MapChartComponent, district_geojson, state_geojson
 from src.components.plots.bubble_chart import render_bubble_with_legend
-
-BASE_URL = "http://localhost:8000"
+from src.components.plots.figure_export import EXPORT_FORMATS, export_selection, FigureExportError, export_cache
+from src.components.plots.figure_cache import figure_cache
+from src.components.callback_diagnostics import TimedSession, instrument_callbacks
+from metrics import CONTENT_TYPE, REQUEST_LATENCY, REQUESTS_IN_FLIGHT, registry
+from structured_logging import configure_logging
+
+BASE_URL = os.environ.get("API_BASE_URL", "http://localhost:8000")
+
+logger = logging.getLogger(__name__)
+
+# Shared keep-alive session; also times backend waits for the callback diagnostics
+backend = TimedSession()
+
+registry.register_cache("figure", figure_cache.stats)
+registry.register_cache("figure_export", export_cache.stats)
+
+
+def indicator_options(category_indicators, category_id):
+    """Dropdown options for a category from the precomputed category -> indicator map."""
+    indicators = (category_indicators or {}).get(str(int(category_id)), [])
+    return [{"label": i["indicator_name"], "value": i["indicator_id"]} for i in indicators]
+
+def figure_cache_key(response_json, indicator_ids, category_type, selected_state):
+    """Figure cache key for a selection, tied to the rounds and data version the API answered with."""
+    return (indicator_ids, category_type, selected_state,
+            response_json.get("nfhs_ids"), response_json.get("data_version"))
+
+def build_export_figures(response_json, category_type, selected_state):
+    """Build the bar, violin and map figures of a selection into the figure cache, as tab 1 draws them."""
+    label_field = "district_name" if selected_state else "state_name"
+    for ind in response_json.get("indicator_data", []):
+        raw = ind["data"]
+        name = ind["indicator_name"]
+        cache_key = figure_cache_key(response_json, [ind["indicator_id"]], category_type, selected_state)
+        labels = [entry.get(label_field, "Unknown") for entry in raw]
+        values = [entry.get(category_type) for entry in raw]
+
+        BarChartComponent(chart_id="export-bar", x_data=values, y_data=labels, category_=category_type,
+                          label_field=label_field, title=name, indicator_id=ind["indicator_id"],
+                          cache_key=cache_key)
+        ViolinChartComponent(chart_id="export-violin", x_data=labels, y_data=values,
+                             title=f"{name} ({category_type})", cache_key=cache_key)
+
+        if selected_state:
+            geojson = filter_geojson_by_district_ids(district_geojson, [r["district_id"] for r in raw])
+            records = [{"district_id": r["district_id"], "district_name": r["district_name"],
+                        "value": r.get(category_type)} for r in raw if r.get(category_type) is not None]
+            MapChartComponent(chart_id="export-map", data=records, geojson=geojson,
+                              location_key="district_name", feature_id_key="properties.district_name",
+                              value_key="value", label_key="district_name", title=f"{name} (District View)",
+                              center=compute_geojson_center(geojson), cache_key=cache_key)
+        else:
+            records = [{"state_acronym": r["state_acronym"], "state_name": r["state_name"],
+                        "value": r.get(category_type)} for r in raw if r.get(category_type) is not None]
+            MapChartComponent(chart_id="export-map", data=records, geojson=state_geojson,
+                              location_key="state_acronym", feature_id_key="properties.state_acronym",
+                              value_key="value", label_key="state_name", title=f"{name} (State View)",
+                              center={"lat": 22, "lon": 80}, cache_key=cache_key)
+
+def submit_summary_job(payload, tab):
+    """Queue a summary on the backend; returns (placeholder text, poller components)."""
+    try:
+        response = backend.post(BASE_URL + "/indicator-summary/jobs", json=payload)
+        response.raise_for_status()
+        job_id = response.json()["job_id"]
+    except (requests.RequestException, KeyError) as e:
+        return f"⚠️ Error generating summary: {str(e)}", html.Div()
+
+    return "⏳ Generating summary...", html.Div([
+        dcc.Store(id=f"summary-job-{tab}", data=job_id),
+        dcc.Interval(id=f"summary-poll-{tab}", interval=750, n_intervals=0)
+    ])
 
 def tab1_layout(states_data, placeholder_categories):
     return html.Div([
@@ -283,11 +354,64 @@ def tab2_layout(states_data, placeholder_categories):
 
 
 def create_layout():
+    configure_logging()
     app = dash.Dash(__name__, suppress_callback_exceptions=True, external_stylesheets=[dbc.themes.BOOTSTRAP])
     app.enable_dev_tools(debug=False)
 
+    # Time every callback registered below; report on /_diagnostics/callbacks
+    instrument_callbacks(app)
+
+    # === Health endpoints for the production launcher ===
+    @app.server.route("/healthz")
+    def healthz():
+        return {"status": "ok"}
+
+    @app.server.route("/readyz")
+    def readyz():
+        try:
+            backend.get(BASE_URL + "/healthz", timeout=2).raise_for_status()
+        except requests.RequestException as e:
+            return {"status": "unavailable", "detail": str(e)}, 503
+        return {"status": "ready"}
+
+    # === Metrics ===
+    @app.server.before_request
+    def start_request_timer():
+        flask.g.request_started = time.perf_counter()
+        REQUESTS_IN_FLIGHT.inc(app="dash")
+
+    def observe_request(status):
+        started = flask.g.pop("request_started", None)
+        if started is None:
+            return
+        REQUESTS_IN_FLIGHT.dec(app="dash")
+        rule = flask.request.url_rule
+        REQUEST_LATENCY.observe(time.perf_counter() - started, app="dash", method=flask.request.method,
+                                route=rule.rule if rule else "unmatched", status=status)
+
+    @app.server.after_request
+    def observe_response(response):
+        observe_request(response.status_code)
+        return response
+
+    @app.server.teardown_request
+    def observe_failed_request(exc=None):
+        # Only still pending when the request raised before a response was built
+        observe_request(500)
+
+    @app.server.route("/metrics")
+    def metrics():
+        return flask.Response(registry.render(), mimetype=CONTENT_TYPE)
+
     states_data = fetch_states()
     categories_data = fetch_categories()
+    # Category -> indicator options; dropdown callbacks read them from the store, which
+    # is filled again on page load if the API was unreachable when the layout was built
+    category_indicators = fetch_category_indicators()
+    category_options = [
+        {"label": c["categories"], "value": c["categories_id"]}
+        for c in categories_data or []
+    ]
 
     app.layout = dcc.Loading(
         id="global-loading",
@@ -327,6 +451,23 @@ def create_layout():
                 dbc.Container([
                     dbc.Row([
                         dbc.Col(html.H4("Indicators Data Visualization", className="text-white mb-0"), style={"backgroundColor": "#6abf4b"}),
+                        dbc.Col(html.Div([
+                            dcc.RadioItems(
+                                id='figure-display-mode',
+                                options=[{'label': 'Interactive', 'value': 'interactive'},
+                                         {'label': 'Static maps', 'value': 'static'}],
+                                value='interactive',
+                                inline=True,
+                                labelStyle={'marginRight': '10px', 'color': 'white'}
+                            ),
+                            dcc.RadioItems(
+                                id='export-format',
+                                options=[{'label': f.upper(), 'value': f} for f in EXPORT_FORMATS],
+                                value='png',
+                                inline=True,
+                                labelStyle={'marginRight': '10px', 'color': 'white'}
+                            )
+                        ]), width="auto"),
                         dbc.Col(html.Div(id='visualization-nav', children=[
                             dbc.Nav([
                                 dbc.NavLink("Geographic Distribution", href="#", n_clicks=0, id="tab-map-tab", style={"color": "white"}),
@@ -359,6 +500,8 @@ def create_layout():
             dcc.Store(id='view-tab', data='tab-map-tab'),
             dcc.Download(id="download-figures"),
             dcc.Store(id='clicked-state-store'),
+            dcc.Store(id='category-indicator-store', data=category_indicators),
+            dcc.Store(id='category-options-store', data=category_options),
             html.Div(id='visualization-panel'),
 
             # === Footer ===
@@ -526,7 +669,7 @@ def create_layout():
             category_type = "Total"
 
         try:
-            response = requests.post(
+            response = backend.post(
                 BASE_URL + "/getDistrictsByIndicators" if selected_state else BASE_URL + "/getStatesByIndicators",
                 json={
                     "selected_indicators": selected,
@@ -539,7 +682,8 @@ def create_layout():
         except Exception as e:
             return [html.Div(f"API Error: {str(e)}")]
 
-        data = response.json().get("indicator_data", [])
+        payload = response.json()
+        data = payload.get("indicator_data", [])
         if not data:
             return [html.Div("API returned no data")]
 
@@ -563,7 +707,8 @@ def create_layout():
                 category_=category_type,
                 label_field=label_field,
                 title=indicator_name,
-                indicator_id=ind['indicator_id']
+                indicator_id=ind['indicator_id'],
+                cache_key=figure_cache_key(payload, [ind['indicator_id']], category_type, selected_state)
             )
             charts.append(html.Div(chart, style={"marginBottom": "30px"}))
 
@@ -594,7 +739,7 @@ def create_layout():
             category_type = "Total"
 
         try:
-            response = requests.post(
+            response = backend.post(
                 BASE_URL + ("/getDistrictsByIndicators" if selected_state else "/getStatesByIndicators"),
                 json={
                     "selected_indicators": selected,
@@ -606,7 +751,8 @@ def create_layout():
         except Exception as e:
             return [html.Div(f"API Error: {str(e)}")]
 
-        data = response.json().get("indicator_data", [])
+        payload = response.json()
+        data = payload.get("indicator_data", [])
         if not data:
             return [html.Div("API returned no data")]
 
@@ -627,7 +773,8 @@ def create_layout():
                 chart_id=f"violin-chart-{ind['indicator_id']}",
                 x_data=x_vals,
                 y_data=y_vals,
-                title=f"{indicator_name} ({category_type})"
+                title=f"{indicator_name} ({category_type})",
+                cache_key=figure_cache_key(payload, [ind['indicator_id']], category_type, selected_state)
             )
             chart_components.append(html.Div(chart, style={"marginBottom": "30px"}))
 
@@ -649,9 +796,10 @@ def create_layout():
         Input('category-selection-type', 'value'),
         Input('state-selection', 'value'),
         Input("main-tabs", "data"),
+        Input('figure-display-mode', 'value'),
         prevent_initial_call=True
     )
-    def update_map_tab1(selected_indicators, category_type, selected_state, current_tab):
+    def update_map_tab1(selected_indicators, category_type, selected_state, current_tab, display_mode):
         if current_tab != 'tab-1':
             return []
 
@@ -662,7 +810,7 @@ def create_layout():
         endpoint = "/getDistrictsByIndicators" if selected_state else "/getStatesByIndicators"
 
         try:
-            response = requests.post(
+            response = backend.post(
                 BASE_URL + endpoint,
                 json={
                     "selected_indicators": selected,
@@ -671,7 +819,8 @@ def create_layout():
                 }
             )
             response.raise_for_status()
-            indicator_data = response.json().get("indicator_data", [])
+            payload = response.json()
+            indicator_data = payload.get("indicator_data", [])
         except Exception as e:
             return [html.Div(f"API Error: {str(e)}")]
 
@@ -705,7 +854,9 @@ def create_layout():
                         value_key="value",
                         label_key="district_name",
                         title=f"{indicator_name} (District View)",
-                        center=center
+                        center=center,
+                        cache_key=figure_cache_key(payload, [indicator["indicator_id"]], category_type, selected_state),
+                        static=display_mode == 'static'
                     )
                 else:
                     records = [
@@ -724,7 +875,9 @@ def create_layout():
                         value_key="value",
                         label_key="state_name",
                         title=f"{indicator_name} (State View)",
-                        center={"lat": 22, "lon": 80}
+                        center={"lat": 22, "lon": 80},
+                        cache_key=figure_cache_key(payload, [indicator["indicator_id"]], category_type, selected_state),
+                        static=display_mode == 'static'
                     )
             else:
                 chart = MapChartComponent(
@@ -771,7 +924,7 @@ def create_layout():
         }
 
         try:
-            response = requests.post(endpoint, json=payload)
+            response = backend.post(endpoint, json=payload)
             response.raise_for_status()
             response_json = response.json()
         except Exception as e:
@@ -817,7 +970,8 @@ def create_layout():
             y_key=y_key,
             size_key=size_key,
             color_key=color_key,
-            label_key=label_key
+            label_key=label_key,
+            cache_key=figure_cache_key(response_json, indicators, hh_type, selected_state)
         )
 
         return [chart]
@@ -844,48 +998,55 @@ def create_layout():
 
     ### Category and Indicator Dropdown Callback Tab 1 ###
     ### ********************************************** ###
+    ### Reference data ###
+    ### ************** ###
+    @app.callback(
+        Output('category-options-store', 'data'),
+        Output('category-indicator-store', 'data'),
+        Input('category-indicator-store', 'id'),
+        State('category-options-store', 'data'),
+        State('category-indicator-store', 'data'),
+    )
+    def load_reference_data(_, options, indicators):
+        # Runs on every page load; only refetches what the layout could not get from the API
+        if options and indicators:
+            raise dash.exceptions.PreventUpdate
+        if not options:
+            options = [{"label": c["categories"], "value": c["categories_id"]} for c in fetch_categories() or []]
+        if not indicators:
+            indicators = fetch_category_indicators()
+        return options or dash.no_update, indicators or dash.no_update
+
     @app.callback(
         Output("category-selection-dropdown-tab1", "options"),
         Input("category-selection-dropdown-tab1", "value"),
+        Input('category-options-store', 'data'),
     )
-    def update_category_dropdowns(categories_data):
-        # Simulated or fetched categories list
-        categories_data = fetch_categories()  
-        # Convert to dropdown options
-        options = [
-            {"label": c["categories"], "value": c["categories_id"]}
-            for c in categories_data
-        ]
-
-        return options
+    def update_category_dropdowns(selected_category, category_options):
+        return category_options or []
     
     @app.callback(
         Output({'type': 'indicator-selection-tab1', 'index': dash.ALL}, 'options'),
         Input({'type': 'indicator-selection-tab1', 'index': dash.ALL}, 'value'),
         Input('category-selection-dropdown-tab1', 'value'),
+        Input('category-indicator-store', 'data'),
         prevent_initial_call=True
     )
-    def update_indicator_dropdowns(selected_values, selected_category):
+    def update_indicator_dropdowns(selected_values, selected_category, category_indicators):
         if selected_category is None:
             return [[] for _ in range(4)]
-        
-        response = requests.post(BASE_URL  + "/receiveCategories", json={"selected_value": selected_category})
 
-        if response.status_code == 200:
-            # Full list of indicators from backend
-            indicators = response.json().get("state_indicators", [])
-            options_all = [{"label": i["indicator_name"], "value": i["indicator_id"]} for i in indicators]
+        # Full list of indicators for the category, precomputed by the backend
+        options_all = indicator_options(category_indicators, selected_category)
 
-            # Build options for each dropdown based on others' selected values
-            options_per_dropdown = []
-            for i in range(len(selected_values)):
-                used_values = set(selected_values) - {selected_values[i]}
-                filtered_options = [opt for opt in options_all if opt["value"] not in used_values]
-                options_per_dropdown.append(filtered_options)
+        # Build options for each dropdown based on others' selected values
+        options_per_dropdown = []
+        for i in range(len(selected_values)):
+            used_values = set(selected_values) - {selected_values[i]}
+            filtered_options = [opt for opt in options_all if opt["value"] not in used_values]
+            options_per_dropdown.append(filtered_options)
 
-            return options_per_dropdown
-        else:
-            return [[] for _ in range(4)]
+        return options_per_dropdown
         
     ########### AI INSIGHTS TAB 1 ########
     ######################################
@@ -922,7 +1083,7 @@ def create_layout():
                 "category_type": category_type,
                 "selected_state": selected_state
             }
-            response = requests.post(BASE_URL + endpoint, json=payload)
+            response = backend.post(BASE_URL + endpoint, json=payload)
             response.raise_for_status()
             indicator_data = response.json().get("indicator_data", [])
             
@@ -932,8 +1093,8 @@ def create_layout():
                 "category_type": category_type,
                 "selected_state": selected_state
             }
-            stats_response = requests.post(BASE_URL + "/indicator-stats", json=stats_payload)
-            correlation_response = requests.post(BASE_URL + "/indicator-correlation", json=stats_payload)
+            stats_response = backend.post(BASE_URL + "/indicator-stats", json=stats_payload)
+            correlation_response = backend.post(BASE_URL + "/indicator-correlation", json=stats_payload)
 
             stats_response.raise_for_status()
             correlation_response.raise_for_status()
@@ -979,18 +1140,13 @@ def create_layout():
             else:
                 correlation_table = html.P("No statistics available.", className="no-stats-message")
             
-            # --- Call AI summary endpoint ---
+            # --- Queue AI summary job; the text is filled in by the polling callback ---
             summary_payload = {
                 "selected_indicators": selected,
                 "category_type": category_type,
                 "selected_state": selected_state
             }
-            try:
-                summary_response = requests.post(BASE_URL + "/indicator-summary", json=summary_payload)
-                summary_response.raise_for_status()
-                summary_text = summary_response.json().get("summary", "No summary generated.")
-            except requests.RequestException as e:
-                summary_text = f"⚠️ Error generating summary: {str(e)}"
+            summary_text, summary_poller = submit_summary_job(summary_payload, "tab1")
             
             # --- Final Layout ---
             return [
@@ -1016,6 +1172,7 @@ def create_layout():
                         html.H4("Analytical Summary", className="section-header"),
                         html.Div(
                             summary_text,
+                            id="summary-text-tab1",
                             className="summary-box",   # <-- style this in CSS
                             style={
                                 "border": "1px solid #ccc",
@@ -1024,7 +1181,8 @@ def create_layout():
                                 "backgroundColor": "#f9f9f9",
                                 "whiteSpace": "pre-wrap"
                             }
-                        )
+                        ),
+                        summary_poller
                     ], className="summary-container"),
 
                     html.Div([
@@ -1067,6 +1225,95 @@ def create_layout():
             ]
 
 
+    ########### AI SUMMARY POLLING ########
+    ########################################
+    def poll_summary_job(job_id):
+        """Return (summary text or no_update, interval disabled)."""
+        if not job_id:
+            return dash.no_update, True
+        try:
+            response = backend.get(BASE_URL + f"/indicator-summary/jobs/{job_id}", timeout=5)
+            response.raise_for_status()
+            job = response.json()
+        except requests.RequestException as e:
+            return f"⚠️ Error generating summary: {str(e)}", True
+
+        if job["status"] == "done":
+            return (job.get("result") or {}).get("summary", "No summary generated."), True
+        if job["status"] == "failed":
+            return f"⚠️ Error generating summary: {job.get('error')}", True
+        if job.get("partial"):
+            # Render the summary progressively while the model is still generating
+            return job["partial"] + " ▌", False
+        return dash.no_update, False
+
+    for tab in ("tab1", "tab2"):
+        app.callback(
+            Output(f"summary-text-{tab}", "children"),
+            Output(f"summary-poll-{tab}", "disabled"),
+            Input(f"summary-poll-{tab}", "n_intervals"),
+            State(f"summary-job-{tab}", "data"),
+            prevent_initial_call=True
+        )(lambda n_intervals, job_id: poll_summary_job(job_id))
+
+
+    ########### FIGURE EXPORT ########
+    ##################################
+    @app.callback(
+        Output("download-figures", "data"),
+        Input("download-btn", "n_clicks"),
+        Input("download-btn-tab2", "n_clicks"),
+        State({'type': 'indicator-selection-tab1', 'index': ALL}, 'value'),
+        State('category-selection-type', 'value'),
+        State('state-selection', 'value'),
+        State({'type': 'indicator-selection-tab2', 'index': ALL}, 'value'),
+        State('category-selection-type-tab2', 'value'),
+        State('state-selection-tab2', 'value'),
+        State('export-format', 'value'),
+        prevent_initial_call=True
+    )
+    def download_figures(n_tab1, n_tab2, indicators_tab1, category_tab1, state_tab1,
+                         indicators_tab2, category_tab2, state_tab2, export_format):
+        if ctx.triggered_id == "download-btn-tab2":
+            indicators, category_type, selected_state = indicators_tab2, category_tab2, state_tab2
+        else:
+            indicators, category_type, selected_state = indicators_tab1, category_tab1, state_tab1
+
+        selected = [val for val in indicators if val]
+        if not selected:
+            raise dash.exceptions.PreventUpdate
+
+        category_type = category_type or "Total"
+        try:
+            response = backend.post(
+                BASE_URL + ("/getDistrictsByIndicators" if selected_state else "/getStatesByIndicators"),
+                json={"selected_indicators": selected, "category_type": category_type,
+                      "selected_state": selected_state}
+            )
+            response.raise_for_status()
+            payload = response.json()
+        except requests.RequestException as e:
+            logger.warning("Figure export failed: %s", e)
+            raise dash.exceptions.PreventUpdate
+
+        # Viewed figures come from the figure cache; a selection not drawn by this worker is rebuilt
+        try:
+            exported = export_selection(
+                selected, category_type, selected_state, export_format or "png",
+                rounds=payload.get("nfhs_ids"), data_version=payload.get("data_version"),
+                rebuild=lambda: build_export_figures(payload, category_type, selected_state)
+            )
+        except FigureExportError as e:
+            logger.warning("Figure export failed: %s", e)
+            raise dash.exceptions.PreventUpdate
+
+        if exported is None:
+            raise dash.exceptions.PreventUpdate
+
+        filename, content = exported
+        return dcc.send_bytes(content, filename)
+
+
     ''' -------     TAB 2 Callbacks   -------'''
     ############################################
 
@@ -1098,15 +1345,10 @@ def create_layout():
         Output("category-selection-dropdown-tab2-b", "options"),
         Input("category-selection-dropdown-tab2-a", "value"),
         Input("category-selection-dropdown-tab2-b", "value"),
+        Input('category-options-store', 'data'),
     )
-    def update_category_dropdowns_tab2(selected_a, selected_b):
-        categories_data = fetch_categories()
-
-        # Convert all categories into dropdown format
-        all_options = [
-            {"label": c["categories"], "value": c["categories_id"]}
-            for c in categories_data
-        ]
+    def update_category_dropdowns_tab2(selected_a, selected_b, category_options):
+        all_options = category_options or []
 
         if selected_a:
             allowed_b_ids = CATEGORY_RELATIONS.get(selected_a, [])
@@ -1128,21 +1370,17 @@ def create_layout():
         Input({'type': 'indicator-selection-tab2', 'index': dash.ALL}, 'value'),
         Input('category-selection-dropdown-tab2-a', 'value'),
         Input('category-selection-dropdown-tab2-b', 'value'),
+        Input('category-indicator-store', 'data'),
         prevent_initial_call=True
     )
-    def update_indicator_dropdowns_tab2(selected_values, category_a, category_b):
+    def update_indicator_dropdowns_tab2(selected_values, category_a, category_b, category_indicators):
         total_dropdowns = 4
         options_per_dropdown = [[] for _ in range(total_dropdowns)]
 
-        # Helper function to get indicator options
         def get_options(category):
             if category is None:
                 return []
-            response = requests.post(BASE_URL + "/receiveCategories", json={"selected_value": category})
-            if response.status_code == 200:
-                indicators = response.json().get("state_indicators", [])
-                return [{"label": i["indicator_name"], "value": i["indicator_id"]} for i in indicators]
-            return []
+            return indicator_options(category_indicators, category)
 
         # Process first two dropdowns (category A)
         if category_a:
@@ -1192,7 +1430,7 @@ def create_layout():
 
             try:
                 endpoint = "/getDistrictsByIndicators" if selected_state else "/getStatesByIndicators"
-                response = requests.post(
+                response = backend.post(
                     BASE_URL + endpoint,
                     json={
                         "selected_indicators": [indicator_id],
@@ -1204,7 +1442,8 @@ def create_layout():
             except Exception as e:
                 return [html.Div(f"API Error for indicator {indicator_id} (Category ID {cat_id}): {str(e)}")]
 
-            data = response.json().get("indicator_data", [])
+            payload = response.json()
+            data = payload.get("indicator_data", [])
             if not data:
                 charts.append(html.Div(f"No data returned for indicator ID {indicator_id}", style={"color": "orange"}))
                 continue
@@ -1225,7 +1464,8 @@ def create_layout():
                 y_data=y_vals,
                 category_=category_type,
                 label_field=label_field,
-                title=f"{ind['indicator_name']} ({category_type})"
+                title=f"{ind['indicator_name']} ({category_type})",
+                cache_key=figure_cache_key(payload, [indicator_id], category_type, selected_state)
             )
 
             charts.append(html.Div(chart, style={"marginBottom": "30px"}))
@@ -1265,7 +1505,7 @@ def create_layout():
 
         for indicators, cat_label in zip([indicators_cat_a, indicators_cat_b], [cat_a, cat_b]):
             try:
-                response = requests.post(
+                response = backend.post(
                     BASE_URL + "/getDistrictsByIndicators" if selected_state else BASE_URL + "/getStatesByIndicators",
                     json={
                         "selected_indicators": indicators,
@@ -1277,7 +1517,8 @@ def create_layout():
             except Exception as e:
                 return [html.Div(f"API Error for {cat_label}: {str(e)}")]
 
-            indicator_data = response.json().get("indicator_data", [])
+            payload = response.json()
+            indicator_data = payload.get("indicator_data", [])
             if not indicator_data:
                 all_charts.append(html.Div(f"No data returned for category {cat_label}"))
                 continue
@@ -1299,7 +1540,8 @@ def create_layout():
                     chart_id=f"violin-chart-tab2-{indicator_id}",
                     x_data=x_vals,
                     y_data=y_vals,
-                    title=f"{indicator_name} ({category_type})"
+                    title=f"{indicator_name} ({category_type})",
+                    cache_key=figure_cache_key(payload, [indicator_id], category_type, selected_state)
                 )
                 all_charts.append(html.Div(chart, style={"marginBottom": "30px"}))
 
@@ -1321,9 +1563,10 @@ def create_layout():
         Input('category-selection-type-tab2', 'value'),
         Input('state-selection-tab2', 'value'),
         Input("main-tabs", "data"),
+        Input('figure-display-mode', 'value'),
         prevent_initial_call=True
     )
-    def update_map_tab1(selected_indicators, category_type, selected_state, current_tab):
+    def update_map_tab1(selected_indicators, category_type, selected_state, current_tab, display_mode):
         if current_tab != 'tab-2':
             return []
 
@@ -1334,7 +1577,7 @@ def create_layout():
         endpoint = "/getDistrictsByIndicators" if selected_state else "/getStatesByIndicators"
 
         try:
-            response = requests.post(
+            response = backend.post(
                 BASE_URL + endpoint,
                 json={
                     "selected_indicators": selected,
@@ -1343,7 +1586,8 @@ def create_layout():
                 }
             )
             response.raise_for_status()
-            indicator_data = response.json().get("indicator_data", [])
+            payload = response.json()
+            indicator_data = payload.get("indicator_data", [])
         except Exception as e:
             return [html.Div(f"API Error: {str(e)}")]
 
@@ -1377,7 +1621,9 @@ def create_layout():
                         value_key="value",
                         label_key="district_name",
                         title=f"{indicator_name} (District View)",
-                        center=center
+                        center=center,
+                        cache_key=figure_cache_key(payload, [indicator["indicator_id"]], category_type, selected_state),
+                        static=display_mode == 'static'
                     )
                 else:
                     records = [
@@ -1396,7 +1642,9 @@ def create_layout():
                         value_key="value",
                         label_key="state_name",
                         title=f"{indicator_name} (State View)",
-                        center={"lat": 22, "lon": 80}
+                        center={"lat": 22, "lon": 80},
+                        cache_key=figure_cache_key(payload, [indicator["indicator_id"]], category_type, selected_state),
+                        static=display_mode == 'static'
                     )
             else:
                 chart = MapChartComponent(
@@ -1444,7 +1692,7 @@ def create_layout():
         }
 
         try:
-            response = requests.post(endpoint, json=payload)
+            response = backend.post(endpoint, json=payload)
             response.raise_for_status()
             response_json = response.json()
         except Exception as e:
@@ -1490,7 +1738,8 @@ def create_layout():
             y_key=y_key,
             size_key=size_key,
             color_key=color_key,
-            label_key=label_key
+            label_key=label_key,
+            cache_key=figure_cache_key(response_json, indicators, hh_type, selected_state)
         )
 
         return [chart]
@@ -1539,7 +1788,7 @@ def create_layout():
                     "category_type": category_type,
                     "selected_state": selected_state
                 }
-                response = requests.post(BASE_URL + endpoint, json=payload)
+                response = backend.post(BASE_URL + endpoint, json=payload)
                 response.raise_for_status()
                 full_data.extend(response.json().get("indicator_data", []))
 
@@ -1549,8 +1798,8 @@ def create_layout():
                 "category_type": category_type,
                 "selected_state": selected_state
             }
-            stats_response = requests.post(BASE_URL + "/indicator-stats", json=stats_payload)
-            correlation_response = requests.post(BASE_URL + "/indicator-correlation", json=stats_payload)
+            stats_response = backend.post(BASE_URL + "/indicator-stats", json=stats_payload)
+            correlation_response = backend.post(BASE_URL + "/indicator-correlation", json=stats_payload)
 
             stats_response.raise_for_status()
             correlation_response.raise_for_status()
@@ -1592,18 +1841,13 @@ def create_layout():
             else:
                 correlation_table = html.P("No correlations available.", className="no-stats-message")
 
-            # --- AI Summary ---
+            # --- AI Summary (queued; filled in by the polling callback) ---
             summary_payload = {
                 "selected_indicators": selected,
                 "category_type": category_type,
                 "selected_state": selected_state
             }
-            try:
-                summary_response = requests.post(BASE_URL + "/indicator-summary", json=summary_payload)
-                summary_response.raise_for_status()
-                summary_text = summary_response.json().get("summary", "No summary generated.")
-            except requests.RequestException as e:
-                summary_text = f"⚠️ Error generating summary: {str(e)}"
+            summary_text, summary_poller = submit_summary_job(summary_payload, "tab2")
 
             # --- Final Layout ---
             return [
@@ -1625,6 +1869,7 @@ def create_layout():
                         html.H4("Analytical Summary", className="section-header"),
                         html.Div(
                             summary_text,
+                            id="summary-text-tab2",
                             className="summary-box",
                             style={
                                 "border": "1px solid #ccc",
@@ -1633,7 +1878,8 @@ def create_layout():
                                 "backgroundColor": "#f9f9f9",
                                 "whiteSpace": "pre-wrap"
                             }
-                        )
+                        ),
+                        summary_poller
                     ], className="summary-container"),
                 ], className="insights-container")
             ]
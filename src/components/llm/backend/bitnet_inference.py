@@ -110,11 +110,17 @@
 
 import re
 import os
-import subprocess
+import asyncio
 import json
+import logging
 import httpx
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
+from src.components.llm.backend.http_clients import MCP_MATH_SERVICE_URL, http_clients
+from src.components.llm.backend.mcp_math_service import compute_basic_analysis
+from src.components.llm.backend.llm_backend import LLMBackendError, get_llm_backend
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI()
 
@@ -148,16 +154,23 @@ def build_instruction_from_table(indicator_data):
 # === Call MCP math service === (Original function maintained)
 async def get_stats_from_mcp(indicator_data):
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post("http://localhost:8001/compute-stats", json={"indicator_data": indicator_data})
+        if not MCP_MATH_SERVICE_URL:
+            # Co-located: compute directly, no HTTP or JSON round trip
+            return await asyncio.to_thread(compute_basic_analysis, indicator_data, True)
+
+        async with http_clients["mcp"].session() as client:
+            response = await client.post("/compute-stats", json={"indicator_data": indicator_data, "compact": True})
             response.raise_for_status()
             return response.json()
     except Exception as e:
-        print(f"[Warning] MCP service failed: {e}")
+        logger.warning("MCP service failed: %s", e)
         return {"stats": {}, "correlation": {}}
 
 # === Gemini insight generation === (FIXED - this was the missing function)
-def generate_stat_summary(
+INSIGHT_MODEL = os.environ.get("INSIGHT_MODEL", "gemma3:270m")
+insight_llm = get_llm_backend(INSIGHT_MODEL)
+
+async def agenerate_stat_summary(
     instruction: str,
     max_tokens: int = 500,
     verbose: bool = True
@@ -176,20 +189,12 @@ def generate_stat_summary(
     )
 
     try:
-        result = subprocess.run(
-            ["ollama", "run", "gemma3:270m"],
-            input=prompt,
-            text=True,
-            capture_output=True,
-            encoding="utf-8",
-            errors="ignore"
-        )
+        response = await insight_llm.generate(prompt, num_predict=max_tokens)
 
         if verbose:
-            print("DEBUG: Gemini raw output:", result.stdout)
-            print("DEBUG: Gemini stderr:", result.stderr)
+            logger.debug("Insight model raw output", extra={"payload": {"response": response}})
 
-        response = result.stdout.strip()
+        response = response.strip()
 
         ## If regex matches, extract key content, otherwise keep full response
         match = re.search(r"(?:##|1\.)[\s\S]+", response, re.IGNORECASE)
@@ -198,14 +203,16 @@ def generate_stat_summary(
         elif not response:
             response = "No insights generated."
 
-        print(response, '***************************')
-
     except Exception as e:
-        print(f"Error calling the LLM Model: {e}")
+        logger.error("Error calling the LLM model: %s", e)
         response = "Error generating insights!."
 
     return response.strip()
 
+def generate_stat_summary(instruction: str, max_tokens: int = 500, verbose: bool = True) -> str:
+    """Blocking wrapper for scripts; request handlers await agenerate_stat_summary."""
+    return run_sync(agenerate_stat_summary(instruction, max_tokens, verbose))
+
 # === Helper function to format summary in Markdown === (Original function maintained)
 def format_summary_markdown(summary: str) -> str:
     # Here we can add more formatting rules if needed
@@ -518,7 +525,7 @@ Generate insights using the following standardized structure:
         return instruction
 
 # === NEW ENHANCED FUNCTIONS ===
-def generate_standardized_insights(instruction: str, max_tokens: int = 400) -> str:
+async def agenerate_standardized_insights(instruction: str, max_tokens: int = 400) -> str:
     """Generate insights with consistent formatting and error handling"""
     
     # Enhanced prompt with strict formatting requirements
@@ -535,25 +542,12 @@ def generate_standardized_insights(instruction: str, max_tokens: int = 400) -> s
     """
     
     try:
-        result = subprocess.run(
-            ["ollama", "run", "gemma3:270m"],
-            input=prompt,
-            text=True,
-            capture_output=True,
-            encoding="utf-8",
-            errors="ignore",
-            timeout=30  # Add timeout for reliability
-        )
-        
-        if result.returncode != 0:
-            print(f"WARNING: Ollama process failed with code {result.returncode}")
-            return generate_fallback_insights(instruction)
-        
-        response = result.stdout.strip()
+        response = await insight_llm.generate(prompt, timeout=30, num_predict=max_tokens)  # Add timeout for reliability
+        response = response.strip()
         
         # Validate and clean response
         if not response or len(response) < 50:
-            print("WARNING: Insufficient response from model")
+            logger.warning("Insufficient response from model (%d chars)", len(response))
             return generate_fallback_insights(instruction)
         
         # Extract markdown content
@@ -564,13 +558,20 @@ def generate_standardized_insights(instruction: str, max_tokens: int = 400) -> s
         
         return response
         
-    except subprocess.TimeoutExpired:
-        print("ERROR: Model generation timed out")
+    except asyncio.TimeoutError:
+        logger.error("Model generation timed out")
+        return generate_fallback_insights(instruction)
+    except LLMBackendError as e:
+        logger.warning("LLM server request failed: %s", e)
         return generate_fallback_insights(instruction)
     except Exception as e:
-        print(f"ERROR: Model generation failed - {e}")
+        logger.exception("Model generation failed: %s", e)
         return generate_fallback_insights(instruction)
 
+def generate_standardized_insights(instruction: str, max_tokens: int = 400) -> str:
+    """Blocking wrapper for scripts; request handlers await agenerate_standardized_insights."""
+    return run_sync(agenerate_standardized_insights(instruction, max_tokens))
+
 def generate_fallback_insights(instruction: str) -> str:
     """Generate basic insights when AI model fails"""
     return """
@@ -590,16 +591,33 @@ def generate_fallback_insights(instruction: str) -> str:
             """
 
 # === NEW ENHANCED INSTRUCTION BUILDER ===
-def build_standardized_instruction_from_table(indicator_data, region_type="regions"):
+async def abuild_standardized_instruction_from_table(indicator_data, region_type="regions"):
     """Enhanced version of build_instruction_from_table with standardization"""
-    generator = StandardizedInsightGenerator()
-    
     # Get MCP data
-    import asyncio
-    mcp_result = asyncio.run(get_stats_from_mcp(indicator_data))
+    mcp_result = await get_stats_from_mcp(indicator_data)
     
     indicator_names = [entry.get("indicator_name", "") 
                       for entry in indicator_data 
                       if isinstance(entry, dict)]
     
-    return generator.build_standardized_instruction(mcp_result, indicator_names, region_type)
\ No newline at end of file
+    generator = StandardizedInsightGenerator()
+    return generator.build_standardized_instruction(mcp_result, indicator_names, region_type)
+
+async def agenerate_insights_from_table(indicator_data, region_type="regions", max_tokens: int = 400) -> dict:
+    """Full insight pipeline: stats, standardized instruction, then LLM insights."""
+    instruction = await abuild_standardized_instruction_from_table(indicator_data, region_type)
+    insights = await agenerate_standardized_insights(instruction, max_tokens)
+    return {"instruction": instruction, "insights": insights}
+
+def run_sync(coro):
+    """Run a coroutine from synchronous script code; never call from inside an event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    coro.close()
+    raise RuntimeError("Called a blocking wrapper inside a running event loop; await the async version instead")
+
+def build_standardized_instruction_from_table(indicator_data, region_type="regions"):
+    """Blocking wrapper for scripts; request handlers await abuild_standardized_instruction_from_table."""
+    return run_sync(abuild_standardized_instruction_from_table(indicator_data, region_type))
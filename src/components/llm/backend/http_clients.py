@@ -0,0 +1,119 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+import httpx
+
+OLLAMA_URL = os.environ.get("OLLAMA_URL", "http://localhost:11434")
+# Unset means the math service runs in-process (see get_stats_from_mcp)
+MCP_MATH_SERVICE_URL = os.environ.get("MCP_MATH_SERVICE_URL")
+
+
+class BackendClient:
+    """Pooled keep-alive client for one upstream service.
+
+    ``max_concurrency`` caps the requests in flight from this process; extra
+    callers wait for a slot instead of piling onto the backend.
+    """
+
+    def __init__(self, name: str, base_url: str, timeout: httpx.Timeout,
+                 max_connections: int = 10, max_keepalive: int = 5,
+                 max_concurrency: Optional[int] = None):
+        self.name = name
+        self.base_url = base_url
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=30
+        )
+        self.max_concurrency = max_concurrency
+        self.client: Optional[httpx.AsyncClient] = None
+        self.active = 0
+        self.waiting = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def start(self):
+        # Created here so the pool and semaphore bind to the server's running loop
+        self.client = httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout, limits=self.limits)
+        if self.max_concurrency:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def stop(self):
+        if self.client is not None:
+            await self.client.aclose()
+        self.client = None
+        self._semaphore = None
+
+    @asynccontextmanager
+    async def session(self):
+        """Yield a client holding one concurrency slot for the whole block (including streamed bodies)."""
+        if self.client is None:
+            # Scripts that never ran the app lifespan get a one-off client
+            async with httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout) as client:
+                yield client
+            return
+
+        if self._semaphore is None:
+            self.active += 1
+            try:
+                yield self.client
+            finally:
+                self.active -= 1
+            return
+
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        try:
+            yield self.client
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+
+class HTTPClientRegistry:
+    """Application-scoped clients, started and stopped in the FastAPI lifespan."""
+
+    def __init__(self):
+        self.backends: Dict[str, BackendClient] = {}
+
+    def register(self, name: str, base_url: str, **options) -> BackendClient:
+        backend = BackendClient(name, base_url, **options)
+        self.backends[name] = backend
+        return backend
+
+    def __getitem__(self, name: str) -> BackendClient:
+        return self.backends[name]
+
+    async def start(self):
+        for backend in self.backends.values():
+            await backend.start()
+
+    async def stop(self):
+        for backend in self.backends.values():
+            await backend.stop()
+
+
+http_clients = HTTPClientRegistry()
+
+# A single local Ollama instance serves a few generations at a time at best;
+# long read timeout because CPU generation of a full summary can take minutes
+http_clients.register(
+    "ollama", OLLAMA_URL,
+    timeout=httpx.Timeout(300.0, connect=5.0),
+    max_connections=int(os.environ.get("OLLAMA_MAX_CONNECTIONS", 4)),
+    max_keepalive=int(os.environ.get("OLLAMA_MAX_CONNECTIONS", 4)),
+    max_concurrency=int(os.environ.get("OLLAMA_MAX_CONCURRENCY", 2))
+)
+if MCP_MATH_SERVICE_URL:
+    http_clients.register(
+        "mcp", MCP_MATH_SERVICE_URL,
+        timeout=httpx.Timeout(30.0, connect=5.0),
+        max_connections=20,
+        max_keepalive=10
+    )
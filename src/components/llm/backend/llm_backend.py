@@ -0,0 +1,147 @@
+import abc
+import asyncio
+import json
+import os
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+from metrics import LLM_GENERATION_LATENCY, LLM_TOKENS, LLM_TOKENS_PER_SECOND
+from src.components.llm.backend.http_clients import http_clients
+
+
+class LLMBackendError(Exception):
+    """Raised when the LLM server rejects or fails a generation."""
+
+
+class LLMBackend(abc.ABC):
+    """Async text generation against a long-running local LLM server.
+
+    Requests go through the pooled clients in ``http_clients``. Cancelling the
+    consuming task closes the streamed response, which stops generation on
+    the server instead of letting it run to completion.
+    """
+
+    client_name = None
+
+    def __init__(self, model: str, options: Optional[Dict[str, Any]] = None):
+        self.model = model
+        self.options = dict(options or {})
+
+    @abc.abstractmethod
+    def stream(self, prompt: str, **options) -> AsyncIterator[str]:
+        """Yield text fragments as the server generates them."""
+
+    async def generate(self, prompt: str, timeout: Optional[float] = None, **options) -> str:
+        """Collect the full response; ``timeout`` bounds the whole generation."""
+        async def collect():
+            return "".join([fragment async for fragment in self.stream(prompt, **options)])
+
+        return await asyncio.wait_for(collect(), timeout)
+
+
+class OllamaBackend(LLMBackend):
+    """Ollama ``/api/generate`` with the model kept loaded between requests."""
+
+    client_name = "ollama"
+
+    def __init__(self, model: str, options: Optional[Dict[str, Any]] = None,
+                 keep_alive: str = os.environ.get("OLLAMA_KEEP_ALIVE", "30m")):
+        super().__init__(model, options)
+        self.keep_alive = keep_alive
+
+    async def stream(self, prompt: str, **options) -> AsyncIterator[str]:
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": True,
+            "keep_alive": self.keep_alive,
+            # Sampling settings are only honoured inside "options"
+            "options": {**self.options, **options}
+        }
+        labels = {"backend": self.client_name, "model": self.model}
+        started = time.perf_counter()
+        async with http_clients[self.client_name].session() as client:
+            async with client.stream("POST", "/api/generate", json=payload) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    raise LLMBackendError(f"Ollama request failed: {response.text}")
+
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        raise LLMBackendError(chunk["error"])
+                    if chunk.get("response"):
+                        yield chunk["response"]
+                    if chunk.get("done"):
+                        LLM_GENERATION_LATENCY.observe(time.perf_counter() - started, **labels)
+                        # Ollama reports eval_duration in nanoseconds
+                        if chunk.get("eval_count") and chunk.get("eval_duration"):
+                            LLM_TOKENS.inc(chunk["eval_count"], **labels)
+                            LLM_TOKENS_PER_SECOND.observe(chunk["eval_count"] / (chunk["eval_duration"] / 1e9), **labels)
+                        break
+
+
+class OpenAICompatibleBackend(LLMBackend):
+    """Any local server exposing the OpenAI ``/v1/completions`` API (llama.cpp, vLLM, LM Studio)."""
+
+    client_name = "openai"
+
+    # Ollama option names mapped to their OpenAI equivalents
+    OPTION_NAMES = {"num_predict": "max_tokens"}
+
+    async def stream(self, prompt: str, **options) -> AsyncIterator[str]:
+        merged = {**self.options, **options}
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": True,
+            **{self.OPTION_NAMES.get(key, key): value for key, value in merged.items()}
+        }
+        labels = {"backend": self.client_name, "model": self.model}
+        started = time.perf_counter()
+        chunks = 0
+        async with http_clients[self.client_name].session() as client:
+            async with client.stream("POST", "/completions", json=payload) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    raise LLMBackendError(f"LLM server request failed: {response.text}")
+
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        # Streamed chunks carry one token each on llama.cpp and vLLM
+                        elapsed = time.perf_counter() - started
+                        LLM_GENERATION_LATENCY.observe(elapsed, **labels)
+                        LLM_TOKENS.inc(chunks, **labels)
+                        if elapsed > 0:
+                            LLM_TOKENS_PER_SECOND.observe(chunks / elapsed, **labels)
+                        break
+                    choices = json.loads(data).get("choices") or []
+                    if choices and choices[0].get("text"):
+                        chunks += 1
+                        yield choices[0]["text"]
+
+
+LLM_BACKEND = os.environ.get("LLM_BACKEND", "ollama")
+
+if LLM_BACKEND == "openai":
+    http_clients.register(
+        "openai", os.environ.get("LLM_OPENAI_URL", "http://localhost:8080/v1"),
+        timeout=httpx.Timeout(300.0, connect=5.0),
+        max_connections=int(os.environ.get("LLM_OPENAI_MAX_CONNECTIONS", 4)),
+        max_keepalive=int(os.environ.get("LLM_OPENAI_MAX_CONNECTIONS", 4)),
+        max_concurrency=int(os.environ.get("LLM_OPENAI_MAX_CONCURRENCY", 2))
+    )
+
+
+def get_llm_backend(model: str, options: Optional[Dict[str, Any]] = None) -> LLMBackend:
+    """Backend selected by ``LLM_BACKEND`` (``ollama`` or ``openai``)."""
+    if LLM_BACKEND == "openai":
+        return OpenAICompatibleBackend(model, options)
+    return OllamaBackend(model, options)
@@ -48,10 +48,10 @@
 
 from fastapi import FastAPI, Request
 import numpy as np
-import pandas as pd
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, asdict
 from enum import Enum
+import asyncio
 import json
 
 app = FastAPI()
@@ -77,6 +77,32 @@ class EnhancedStats:
     outlier_count: int
     variability_level: str
 
+@dataclass
+class EnhancedStatsBatch:
+    """Enhanced statistics for many indicators at once, one array entry per indicator"""
+    names: List[str]
+    count: np.ndarray
+    mean: np.ndarray
+    median: np.ndarray
+    min: np.ndarray
+    max: np.ndarray
+    std_dev: np.ndarray
+    coefficient_of_variation: np.ndarray
+    q25: np.ndarray
+    q75: np.ndarray
+    range_span: np.ndarray
+    outlier_count: np.ndarray
+    variability_level: np.ndarray
+
+    def to_enhanced_stats(self) -> Dict[str, "EnhancedStats"]:
+        """Per-indicator EnhancedStats for indicators with at least one value"""
+        columns = [getattr(self, f).tolist() for f in EnhancedStats.__dataclass_fields__]
+        counts = self.count.tolist()
+        return {
+            name: EnhancedStats(*(column[i] for column in columns))
+            for i, name in enumerate(self.names) if counts[i]
+        }
+
 @dataclass
 class CorrelationAnalysis:
     """Detailed correlation analysis"""
@@ -92,6 +118,90 @@ class ComparativeAnalysis:
     variability_ranking: List[Dict[str, Any]]
     regional_patterns: Dict[str, Any]
 
+# Coefficient-of-variation cut points for _classify_variability, for np.digitize
+VARIABILITY_BINS = np.array([5, 10, 15, 20])
+VARIABILITY_LABELS = np.array(["very_low", "low", "moderate", "high", "very_high"])
+
+# |r| cut points matching analyze_correlation
+STRENGTH_BINS = np.array([0.2, 0.4, 0.6, 0.8])
+STRENGTH_LABELS = np.array(["negligible", "weak", "moderate", "strong", "very_strong"])
+SIGNIFICANCE_BINS = np.array([0.3, 0.5, 0.7])
+SIGNIFICANCE_LABELS = np.array(["not_significant", "low", "moderate", "high"])
+
+def region_key(row: Dict[str, Any], position: int):
+    """Identity of the region and survey round a data row belongs to"""
+    # Rows of different rounds for the same region are separate observations
+    nfhs_id = row.get("nfhs_id")
+    if row.get("district_id") is not None:
+        return ("district", row["district_id"], nfhs_id)
+    if row.get("district_name") is not None:
+        return ("district", row.get("state_id", row.get("state_name")), row["district_name"], nfhs_id)
+    if row.get("state_name") is not None:
+        return ("state", row["state_name"], nfhs_id)
+    # Rows without any region field can only be paired by position
+    return ("row", position)
+
+def region_aligned_matrix(indicator_data: List[Dict[str, Any]], value_key: str = "Total"):
+    """Build a regions x indicators matrix with NaN where an indicator has no value for a region.
+
+    Returns ``(indicator_names, region_keys, matrix)``. Indicators without a
+    single numeric value are left out.
+    """
+    columns = {}
+    regions = {}
+    for entry in indicator_data:
+        if not isinstance(entry, dict):
+            continue
+        
+        name = entry.get("indicator_name")
+        if not name:
+            continue
+        
+        column = {}
+        for position, row in enumerate(entry.get("data", []) or []):
+            if not isinstance(row, dict):
+                continue
+            value = row.get(value_key)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                key = region_key(row, position)
+                column[regions.setdefault(key, len(regions))] = value
+        if column:
+            columns[name] = column
+
+    matrix = np.full((len(regions), len(columns)), np.nan)
+    for j, column in enumerate(columns.values()):
+        matrix[list(column.keys()), j] = list(column.values())
+    return list(columns.keys()), list(regions.keys()), matrix
+
+def pairwise_correlation(matrix: np.ndarray, min_periods: int = 2):
+    """Pearson correlation of every column pair over the rows where both are present.
+
+    Uses masked matrix products, so the cost is a few (k x n) @ (n x k)
+    multiplications instead of a Python loop over pairs. Returns
+    ``(correlation, pair_counts)``; undefined pairs (too few shared regions
+    or zero variance) are NaN.
+    """
+    present = ~np.isnan(matrix)
+    mask = present.astype(float)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # Centre each column first; correlation is shift-invariant and this
+        # keeps the sums of squares numerically stable
+        centred = np.where(present, matrix - np.nanmean(matrix, axis=0), 0.0) if matrix.size else matrix
+
+        n = mask.T @ mask
+        sum_x = centred.T @ mask          # [i, j]: sum of column i where j is also present
+        sum_xx = (centred ** 2).T @ mask
+        sum_xy = centred.T @ centred
+
+        cov = sum_xy - sum_x * sum_x.T / n
+        var_x = sum_xx - sum_x ** 2 / n
+        var_y = sum_xx.T - sum_x.T ** 2 / n
+        corr = cov / np.sqrt(var_x * var_y)
+
+    corr[(n < min_periods) | ~np.isfinite(corr)] = np.nan
+    return np.clip(corr, -1.0, 1.0), n.astype(int)
+
 class EnhancedStatsCalculator:
     """Enhanced statistical calculator with comprehensive analysis"""
     
@@ -147,6 +257,49 @@ class EnhancedStatsCalculator:
             variability_level=variability_level
         )
     
+    def calculate_enhanced_stats_batch(self, matrix: np.ndarray, names: List[str]) -> EnhancedStatsBatch:
+        """Calculate comprehensive statistics for every column of a regions x indicators matrix.
+
+        Missing values are NaN. All five quantiles come from one
+        ``np.nanpercentile`` call, and every other measure is a single
+        vectorised pass over the matrix.
+        """
+        matrix = np.asarray(matrix, dtype=float)
+        present = ~np.isnan(matrix)
+        count = present.sum(axis=0)
+        has_data = count > 0
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            quantiles = np.full((5, matrix.shape[1]), np.nan)
+            if has_data.any():
+                quantiles[:, has_data] = np.nanpercentile(matrix[:, has_data], [0, 25, 50, 75, 100], axis=0)
+            min_val, q25, median_val, q75, max_val = quantiles
+
+            mean_val = np.where(present, matrix, 0.0).sum(axis=0) / count
+            deviations = np.where(present, matrix - mean_val, 0.0)
+            std_dev = np.sqrt((deviations ** 2).sum(axis=0) / count)
+            cv = np.where(mean_val != 0, std_dev / mean_val * 100, 0.0)
+
+            # Outlier detection using IQR method (NaN compares False)
+            iqr = q75 - q25
+            outliers = (matrix < q25 - 1.5 * iqr) | (matrix > q75 + 1.5 * iqr)
+
+        return EnhancedStatsBatch(
+            names=list(names),
+            count=count,
+            mean=mean_val,
+            median=median_val,
+            min=min_val,
+            max=max_val,
+            std_dev=std_dev,
+            coefficient_of_variation=cv,
+            q25=q25,
+            q75=q75,
+            range_span=max_val - min_val,
+            outlier_count=outliers.sum(axis=0),
+            variability_level=VARIABILITY_LABELS[np.digitize(np.nan_to_num(cv), VARIABILITY_BINS)]
+        )
+    
     def _classify_variability(self, cv: float) -> str:
         """Classify variability based on coefficient of variation"""
         if cv >= 20:
@@ -160,6 +313,27 @@ class EnhancedStatsCalculator:
         else:
             return "very_low"
     
+    def classify_correlations(self, correlation: np.ndarray) -> Dict[str, np.ndarray]:
+        """Classify every defined pair in the upper triangle of a correlation matrix at once.
+
+        Same categories as analyze_correlation; returns parallel arrays
+        ``i``, ``j``, ``r``, ``strength``, ``significance`` and ``relationship``.
+        """
+        i, j = np.triu_indices(correlation.shape[0], k=1)
+        r = correlation[i, j]
+        defined = ~np.isnan(r)
+        i, j, r = i[defined], j[defined], r[defined]
+        abs_r = np.abs(r)
+        
+        return {
+            "i": i,
+            "j": j,
+            "r": r,
+            "strength": STRENGTH_LABELS[np.digitize(abs_r, STRENGTH_BINS)],
+            "significance": SIGNIFICANCE_LABELS[np.digitize(abs_r, SIGNIFICANCE_BINS)],
+            "relationship": np.where(r > 0.1, "positive", np.where(r < -0.1, "negative", "neutral"))
+        }
+    
     def analyze_correlation(self, corr_value: float, 
                           indicator1: str, indicator2: str) -> CorrelationAnalysis:
         """Analyze correlation with detailed categorization"""
@@ -278,63 +452,82 @@ class EnhancedStatsCalculator:
             }
         }
 
-### Enhanced API endpoint
-@app.post("/compute-enhanced-stats")
-async def compute_enhanced_stats(request: Request):
-    """Enhanced statistics computation with comprehensive analysis"""
-    body = await request.json()
-    indicator_data = body.get("indicator_data", [])
-    
+### Library entry points, called in-process when co-located with the API
+def compute_enhanced_analysis(indicator_data: List[Dict[str, Any]], compact: bool = False) -> Dict[str, Any]:
+    """Enhanced statistics computation with comprehensive analysis
+
+    With ``compact`` the full indicator x indicator ``enhanced_correlation``
+    map is replaced by ``correlation_pairs``, listing only significant pairs.
+    """
     calculator = EnhancedStatsCalculator()
     
-    # Enhanced statistics for each indicator
-    enhanced_stats = {}
-    raw_data_map = {}
+    # Values aligned by region so correlations pair like with like
+    indicators, regions, matrix = region_aligned_matrix(indicator_data)
     
-    for entry in indicator_data:
-        if not isinstance(entry, dict):
-            continue
-        
-        name = entry.get("indicator_name")
-        data = entry.get("data", []) or []
-        valid = [r for r in data if isinstance(r, dict) and r.get("Total") is not None]
-        
-        if not name or not valid:
-            continue
-        
-        values = [r["Total"] for r in valid if isinstance(r["Total"], (int, float))]
-        if not values:
-            continue
-        
-        raw_data_map[name] = values
-        enhanced_stats[name] = calculator.calculate_enhanced_stats(values, name)
+    # All indicators in one vectorised pass
+    enhanced_stats = calculator.calculate_enhanced_stats_batch(matrix, indicators).to_enhanced_stats()
     
     # Enhanced correlation analysis
     enhanced_correlations = {}
     basic_correlations = {}
+    correlation_pairs = []
+    significant_count = 0
     
-    if raw_data_map:
-        # Create DataFrame for correlation calculation
-        df = pd.DataFrame(dict([(k, pd.Series(v)) for k, v in raw_data_map.items()]))
-        correlation_matrix = df.corr()
-        basic_correlations = correlation_matrix.to_dict()
+    if indicators:
+        # Pairwise-complete correlation; undefined pairs are omitted
+        correlation_matrix, pair_counts = pairwise_correlation(matrix)
+        defined = ~np.isnan(correlation_matrix)
+        values = correlation_matrix.tolist()
+        basic_correlations = {
+            indicator2: {indicator1: values[i][j] for i, indicator1 in enumerate(indicators) if defined[i, j]}
+            for j, indicator2 in enumerate(indicators)
+        }
         
-        # Enhanced correlation analysis
-        indicators = list(raw_data_map.keys())
-        for i, indicator1 in enumerate(indicators):
-            enhanced_correlations[indicator1] = {}
-            for j, indicator2 in enumerate(indicators):
-                corr_value = correlation_matrix.loc[indicator1, indicator2]
-                if i != j:  # Skip self-correlation
-                    analysis = calculator.analyze_correlation(corr_value, indicator1, indicator2)
-                    enhanced_correlations[indicator1][indicator2] = asdict(analysis)
-                else:
-                    enhanced_correlations[indicator1][indicator2] = {
-                        "correlation_coefficient": 1.0,
-                        "strength_category": "perfect",
-                        "significance_level": "self",
-                        "relationship_type": "self"
-                    }
+        # Classify the upper triangle in one pass
+        pairs = calculator.classify_correlations(correlation_matrix)
+        significant = np.isin(pairs["significance"], ["high", "moderate"])
+        significant_count = int(significant.sum())
+        
+        if compact:
+            order = np.argsort(-np.abs(pairs["r"][significant]), kind="stable")
+            columns = {key: array[significant][order].tolist() for key, array in pairs.items()}
+            counts = pair_counts[columns["i"], columns["j"]].tolist() if columns["i"] else []
+            correlation_pairs = [
+                {
+                    "indicator1": indicators[i],
+                    "indicator2": indicators[j],
+                    "correlation_coefficient": r,
+                    "regions": n,
+                    "strength_category": strength,
+                    "significance_level": significance,
+                    "relationship_type": relationship
+                }
+                for i, j, r, n, strength, significance, relationship in zip(
+                    columns["i"], columns["j"], columns["r"], counts,
+                    columns["strength"], columns["significance"], columns["relationship"]
+                )
+            ]
+        else:
+            for indicator in indicators:
+                enhanced_correlations[indicator] = {indicator: {
+                    "correlation_coefficient": 1.0,
+                    "strength_category": "perfect",
+                    "significance_level": "self",
+                    "relationship_type": "self"
+                }}
+            columns = {key: array.tolist() for key, array in pairs.items()}
+            for i, j, r, strength, significance, relationship in zip(
+                columns["i"], columns["j"], columns["r"],
+                columns["strength"], columns["significance"], columns["relationship"]
+            ):
+                analysis = {
+                    "correlation_coefficient": r,
+                    "strength_category": strength,
+                    "significance_level": significance,
+                    "relationship_type": relationship
+                }
+                enhanced_correlations[indicators[i]][indicators[j]] = analysis
+                enhanced_correlations[indicators[j]][indicators[i]] = dict(analysis)
     
     # Generate comparative analysis
     comparative_analysis = calculator.generate_comparative_analysis(enhanced_stats)
@@ -358,13 +551,14 @@ async def compute_enhanced_stats(request: Request):
         
         "basic_correlation": basic_correlations,
         
-        "enhanced_correlation": enhanced_correlations,
+        **({"correlation_pairs": correlation_pairs} if compact else {"enhanced_correlation": enhanced_correlations}),
         
         "comparative_analysis": asdict(comparative_analysis),
         
         "metadata": {
             "indicator_count": len(enhanced_stats),
-            "total_data_points": sum(len(values) for values in raw_data_map.values()),
+            "total_data_points": int(np.count_nonzero(~np.isnan(matrix))),
+            "region_count": len(regions),
             "analysis_type": "comprehensive",
             "calculation_method": "enhanced_statistical_analysis"
         },
@@ -372,22 +566,17 @@ async def compute_enhanced_stats(request: Request):
         "summary": {
             "highest_performing": comparative_analysis.performance_ranking[0] if comparative_analysis.performance_ranking else None,
             "most_variable": comparative_analysis.variability_ranking[0] if comparative_analysis.variability_ranking else None,
-            "significant_correlations": len([
-                corr for indicator_corrs in enhanced_correlations.values()
-                for corr in indicator_corrs.values()
-                if corr.get("significance_level") in ["high", "moderate"]
-            ]) // 2  # Divide by 2 to avoid double counting
+            "significant_correlations": significant_count
         }
     }
     
     return response
 
-### Backward compatibility endpoint
-@app.post("/compute-stats")
-async def compute_stats(request: Request):
-    """Backward compatible endpoint that maintains existing structure"""
+def compute_basic_analysis(indicator_data: List[Dict[str, Any]], compact: bool = False) -> Dict[str, Any]:
+    """Original /compute-stats structure plus the enhanced analysis under ``_enhanced``"""
     # Get enhanced analysis
-    enhanced_response = await compute_enhanced_stats(request)
+    enhanced_response = compute_enhanced_analysis(indicator_data, compact)
+    correlation_key = "correlation_pairs" if compact else "enhanced_correlation"
     
     # Return in original format for compatibility
     return {
@@ -397,9 +586,26 @@ async def compute_stats(request: Request):
         # Add enhanced data for new features
         "_enhanced": {
             "enhanced_stats": enhanced_response["enhanced_stats"],
-            "enhanced_correlation": enhanced_response["enhanced_correlation"],
+            correlation_key: enhanced_response[correlation_key],
             "comparative_analysis": enhanced_response["comparative_analysis"],
             "metadata": enhanced_response["metadata"],
             "summary": enhanced_response["summary"]
         }
     }
+
+### Enhanced API endpoint (remote deployments only)
+@app.post("/compute-enhanced-stats")
+async def compute_enhanced_stats(request: Request):
+    body = await request.json()
+    return await asyncio.to_thread(
+        compute_enhanced_analysis, body.get("indicator_data", []), bool(body.get("compact", False))
+    )
+
+### Backward compatibility endpoint
+@app.post("/compute-stats")
+async def compute_stats(request: Request):
+    """Backward compatible endpoint that maintains existing structure"""
+    body = await request.json()
+    return await asyncio.to_thread(
+        compute_basic_analysis, body.get("indicator_data", []), bool(body.get("compact", False))
+    )
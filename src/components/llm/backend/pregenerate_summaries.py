@@ -0,0 +1,112 @@
+"""Pre-generate analytical summaries for popular selections into the summary cache.
+
+    python -m src.components.llm.backend.pregenerate_summaries --config selections.json
+    python -m src.components.llm.backend.pregenerate_summaries --from-log 50 --concurrency 2
+
+The config file is a JSON list of selections, either explicit
+``IndicatorSelection`` payloads or a cross product::
+
+    [
+        {"selected_indicators": [12, 15], "category_type": "Total", "selected_state": null},
+        {"indicator_sets": [[12], [12, 15]], "category_types": ["Total", "ST"], "states": [null, 9]}
+    ]
+
+Run it off-peak against the local Ollama server; at request time the same
+prompts are then served from the cache.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import time
+
+import fastapi_server
+from models.sqlalchemy_models import IndicatorSelection
+from src.components.llm.backend.http_clients import http_clients
+from src.components.llm.backend.summary_cache import summary_cache
+
+
+def expand_selections(entries):
+    """Flatten explicit and cross-product entries into unique selection payloads."""
+    selections = []
+    for entry in entries:
+        if "indicator_sets" in entry:
+            for indicators, category_type, state in itertools.product(
+                entry["indicator_sets"],
+                entry.get("category_types", ["Total"]),
+                entry.get("states", [None])
+            ):
+                selections.append({
+                    "selected_indicators": indicators,
+                    "category_type": category_type,
+                    "selected_state": state
+                })
+        else:
+            selections.append(entry)
+
+    unique = {}
+    for selection in selections:
+        payload = IndicatorSelection(**selection).dict()
+        unique[json.dumps(payload, sort_keys=True)] = payload
+    return list(unique.values())
+
+
+async def pregenerate(selections, concurrency=1):
+    semaphore = asyncio.Semaphore(concurrency)
+    report = {"generated": 0, "cached": 0, "failed": 0}
+
+    async def run(selection):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                async with fastapi_server.async_session() as db:
+                    prepared = await fastapi_server.prepare_summary_prompt(IndicatorSelection(**selection), db)
+                result = await fastapi_server.generate_summary(prepared)
+            except Exception as e:
+                report["failed"] += 1
+                print(f"[failed] {selection}: {e}")
+                return
+
+            outcome = "cached" if result.get("cached") else "generated"
+            report[outcome] += 1
+            print(f"[{outcome}] {selection} in {time.perf_counter() - started:.1f}s")
+
+    await http_clients.start()
+    try:
+        await asyncio.gather(*(run(selection) for selection in selections))
+    finally:
+        await http_clients.stop()
+        await fastapi_server.engine.dispose()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill the summary cache for popular selections")
+    parser.add_argument("--config", help="JSON file with selections to pre-generate")
+    parser.add_argument("--from-log", type=int, default=0, metavar="N",
+                        help="also pre-generate the N most requested selections")
+    parser.add_argument("--since-days", type=float, default=30,
+                        help="only mine selections requested in the last N days")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="parallel generations against Ollama (keep low on CPU-only hosts)")
+    args = parser.parse_args()
+
+    entries = []
+    if args.config:
+        with open(args.config) as f:
+            entries.extend(json.load(f))
+    if args.from_log:
+        since = time.time() - args.since_days * 86400
+        entries.extend(summary_cache.popular_selections(args.from_log, since))
+
+    selections = expand_selections(entries)
+    if not selections:
+        parser.error("no selections given; use --config and/or --from-log")
+
+    print(f"Pre-generating {len(selections)} summaries with concurrency {args.concurrency}")
+    report = asyncio.run(pregenerate(selections, args.concurrency))
+    print(json.dumps(report))
+
+
+if __name__ == "__main__":
+    main()
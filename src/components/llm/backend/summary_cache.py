@@ -0,0 +1,202 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+class SummaryCache:
+    """Persistent cache of raw LLM output keyed by a hash of prompt, model and options.
+
+    Generation is seeded and near-deterministic, so the same rendered prompt
+    yields the same text. Entries live in a SQLite file shared by every
+    worker process; once the stored text exceeds ``max_bytes`` the least
+    recently used entries are evicted.
+
+    The same file holds the state of background summary jobs, so a job
+    submitted to one worker can be polled through any other.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # Opened lazily so forked workers never share a connection
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS summaries (
+                    key TEXT PRIMARY KEY,
+                    model TEXT,
+                    response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_summaries_last_used ON summaries (last_used)")
+            # Selections requested by users, mined by the pre-generation batch job
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS selection_log (
+                    selection TEXT PRIMARY KEY,
+                    requests INTEGER NOT NULL DEFAULT 0,
+                    last_seen REAL NOT NULL
+                )
+            """)
+            # Background summary jobs, written by the worker running them
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS summary_jobs (
+                    job_id TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_summary_jobs_updated_at ON summary_jobs (updated_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def make_key(prompt: str, model: str, options: Dict[str, Any]) -> str:
+        payload = json.dumps({"prompt": prompt, "model": model, "options": options},
+                             sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT response FROM summaries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE summaries SET last_used = ?, hits = hits + 1 WHERE key = ?",
+                         (time.time(), key))
+            conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, response: str, model: str = None):
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, model, response, size, created_at, last_used, hits) "
+                "VALUES (?, ?, ?, ?, ?, ?, 0)",
+                (key, model, response, size, now, now)
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM summaries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        freed = 0
+        stale = []
+        for key, size in conn.execute("SELECT key, size FROM summaries ORDER BY last_used ASC"):
+            stale.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM summaries WHERE key = ?", stale)
+
+    def record_selection(self, selection: Dict[str, Any]):
+        key = json.dumps(selection, sort_keys=True)
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT INTO selection_log (selection, requests, last_seen) VALUES (?, 1, ?) "
+                "ON CONFLICT(selection) DO UPDATE SET requests = requests + 1, last_seen = excluded.last_seen",
+                (key, time.time())
+            )
+            conn.commit()
+
+    def popular_selections(self, limit: int = 50, since: float = 0) -> List[Dict[str, Any]]:
+        """Most requested selections, most popular first."""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT selection FROM selection_log WHERE last_seen >= ? "
+                "ORDER BY requests DESC, last_seen DESC LIMIT ?",
+                (since, limit)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def put_job(self, state: Dict[str, Any]):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO summary_jobs (job_id, state, updated_at) VALUES (?, ?, ?)",
+                (state["job_id"], json.dumps(state, default=str), time.time())
+            )
+            conn.commit()
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT state FROM summary_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def prune_jobs(self, before: float):
+        """Drop jobs not updated since ``before``: finished ones, and ones whose worker died.
+
+        The queue rewrites its queued and running jobs well within that window.
+        """
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM summary_jobs WHERE updated_at < ?", (before,))
+            conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM summaries"
+            ).fetchone()
+        total = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / total) if total else 0.0
+        }
+
+    # Async wrappers keep SQLite I/O off the event loop
+    async def aget(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aput(self, key: str, response: str, model: str = None):
+        await asyncio.to_thread(self.put, key, response, model)
+
+    async def arecord_selection(self, selection: Dict[str, Any]):
+        await asyncio.to_thread(self.record_selection, selection)
+
+    async def aput_job(self, state: Dict[str, Any]):
+        await asyncio.to_thread(self.put_job, state)
+
+    async def aget_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.get_job, job_id)
+
+    async def aprune_jobs(self, before: float):
+        await asyncio.to_thread(self.prune_jobs, before)
+
+
+summary_cache = SummaryCache(
+    os.environ.get("SUMMARY_CACHE_PATH",
+                   os.path.join(os.getcwd(), ".cache", "summary_cache.sqlite3")),
+    max_bytes=int(float(os.environ.get("SUMMARY_CACHE_MAX_MB", 64)) * 1024 * 1024)
+)
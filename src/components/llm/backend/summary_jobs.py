@@ -0,0 +1,214 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SummaryQueueFull(Exception):
+    """Raised when the summary job queue cannot accept more work."""
+
+
+class SummaryJob:
+    """State of one background summary generation"""
+
+    def __init__(self, payload: Dict[str, Any], key: str):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.payload = payload
+        self.status = "queued"      # queued -> running -> done | failed
+        self.result: Optional[Dict[str, Any]] = None
+        self.partial = ""           # de-duplicated text streamed so far
+        self.version = 0
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.persisted_at = 0.0
+        self._updated = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def notify(self):
+        """Wake everyone waiting on this job and arm a fresh event."""
+        self.version += 1
+        event, self._updated = self._updated, asyncio.Event()
+        event.set()
+
+    async def update_partial(self, text: str):
+        self.partial = text
+        self.notify()
+
+    async def wait_for_update(self, since_version: Optional[int] = None,
+                              timeout: Optional[float] = None) -> bool:
+        if self.finished or (since_version is not None and self.version != since_version):
+            return True
+        event = self._updated
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "partial": self.partial,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at
+        }
+
+
+class SummaryJobQueue:
+    """Bounded queue that runs summary generations on a fixed set of worker tasks.
+
+    ``runner(payload, on_progress)`` receives an async callback it can use
+    to publish partial text while generating.
+
+    Identical selections submitted while a job is queued or running share
+    that job instead of generating twice. Finished jobs are kept for
+    ``ttl`` seconds so clients can poll for the result.
+
+    With a ``store`` (``aput_job``/``aget_job``/``aprune_jobs``, see
+    SummaryCache) every state change is also written there, at most every
+    ``persist_interval`` seconds while text is streaming, so jobs can be
+    looked up from any worker process. Queued and running jobs are written
+    again every ``ttl / 4`` seconds, so only finished jobs and those of a
+    dead worker age out of the store.
+    """
+
+    def __init__(self, runner: Callable[..., Awaitable[Dict[str, Any]]],
+                 workers: int = 1, max_pending: int = 32, ttl: float = 600,
+                 store=None, persist_interval: float = 0.5):
+        self.runner = runner
+        self.workers = workers
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self.store = store
+        self.persist_interval = persist_interval
+        self.jobs: Dict[str, SummaryJob] = {}
+        self._active: Dict[str, SummaryJob] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+
+    async def start(self):
+        # Created here so the queue binds to the server's running loop
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        if self.store is not None:
+            self._tasks.append(asyncio.create_task(self._heartbeat()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    @staticmethod
+    def job_key(payload: Dict[str, Any]) -> str:
+        return json.dumps(payload, sort_keys=True, default=str)
+
+    async def submit(self, payload: Dict[str, Any]) -> SummaryJob:
+        if self._queue is None:
+            raise RuntimeError("SummaryJobQueue.start() has not been awaited")
+
+        self._prune()
+        key = self.job_key(payload)
+        if key in self._active:
+            return self._active[key]
+
+        job = SummaryJob(payload, key)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise SummaryQueueFull(f"{self.max_pending} summaries already pending")
+
+        self.jobs[job.id] = job
+        self._active[key] = job
+        # Stored before the id is handed out, so a poll through another worker finds it
+        await self._persist(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[SummaryJob]:
+        return self.jobs.get(job_id)
+
+    async def lookup(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """State of a job run by this process or, through the store, by any other."""
+        job = self.jobs.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        if self.store is not None:
+            return await self.store.aget_job(job_id)
+        return None
+
+    async def _persist(self, job: SummaryJob, force: bool = True):
+        if self.store is None:
+            return
+        now = time.monotonic()
+        if not force and now - job.persisted_at < self.persist_interval:
+            return
+        job.persisted_at = now
+        try:
+            await self.store.aput_job(job.to_dict())
+        except Exception as e:
+            # The job still runs locally; other workers just cannot see it
+            logger.warning("Could not store summary job %s: %s", job.id, e)
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            job.notify()
+
+            async def on_progress(text, job=job):
+                await job.update_partial(text)
+                await self._persist(job, force=False)
+
+            try:
+                await self._persist(job)
+                job.result = await self.runner(job.payload, on_progress)
+                job.status = "done"
+            except asyncio.CancelledError:
+                job.status, job.error = "failed", "cancelled"
+                raise
+            except Exception as e:
+                job.status, job.error = "failed", str(e)
+            finally:
+                job.finished_at = time.time()
+                self._active.pop(job.key, None)
+                job.notify()
+                self._queue.task_done()
+                await self._persist(job)
+                await self._prune_store()
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(self.ttl / 4)
+            for job in list(self._active.values()):
+                await self._persist(job)
+
+    async def _prune_store(self):
+        if self.store is None:
+            return
+        try:
+            await self.store.aprune_jobs(time.time() - self.ttl)
+        except Exception as e:
+            logger.warning("Could not prune stored summary jobs: %s", e)
+
+    def _prune(self):
+        cutoff = time.time() - self.ttl
+        expired = [job_id for job_id, job in self.jobs.items()
+                   if job.finished and job.finished_at < cutoff]
+        for job_id in expired:
+            del self.jobs[job_id]
@@ -1,94 +1,116 @@
 from dash import dcc, html
-import plotly.graph_objects as go
 from src.data.scale_helper import get_scale_range
+from src.components.plots.figure_cache import figure_cache, selection_key, layout_skeleton
+
+# Pre-built layout shared by every bubble chart; only title and ranges vary
+_BUBBLE_LAYOUT = layout_skeleton(
+    height=600,
+    margin=dict(t=60, b=40, l=50, r=30),
+    showlegend=False,
+    plot_bgcolor='white'
+)
 
 # Create Bubble Plot
 def BubbleChartComponent(chart_id, data, x_key, y_key, size_key, color_key, label_key, title=None,
-                         x_id=None, y_id=None, size_id=None, color_id=None):
+                         x_id=None, y_id=None, size_id=None, color_id=None, cache_key=None):
 
     if not data or not all(k in data[0] for k in [x_key, y_key, size_key, color_key, label_key]):
-        fig = go.Figure()
-        fig.update_layout(title="Invalid or empty data")
+        figure = {"data": [], "layout": dict(_BUBBLE_LAYOUT, title=dict(text="Invalid or empty data"))}
     else:
-        # Extract values
-        x_vals = [d[x_key] for d in data]
-        y_vals = [d[y_key] for d in data]
-        sizes = [d[size_key] for d in data]
-        colors = [d[color_key] for d in data]
-        labels = [d[label_key] for d in data]
-
-        # Get fixed ranges
-        x_range = get_scale_range(x_id)
-        y_range = get_scale_range(y_id)
-        size_range = get_scale_range(size_id)
-        color_range = get_scale_range(color_id)
-
-        # Fallbacks if size_range not available
-        max_size = max(sizes) if sizes else 1
-        sizeref = 2. * max_size / (100. ** 2)
-
-        if size_range:
-            sizeref = 2. * size_range[1] / (100. ** 2)
-
-        fig = go.Figure(
-            data=go.Scatter(
-                x=x_vals,
-                y=y_vals,
-                mode='markers',
-                marker=dict(
-                    size=sizes,
-                    color=colors,
-                    colorscale=[
-                        [0.0, "#b6d6f4"],
-                        [0.5, "#a8d1f8"],
-                        [1.0, "#084594"]
-                    ],
-                    colorbar=dict(title=""),
-                    cmin=color_range[0] if color_range else None,
-                    cmax=color_range[1] if color_range else None,
-                    showscale=True,
-                    sizemode='area',
-                    sizeref=sizeref,
-                    sizemin=4,
-                    line=dict(width=0.5, color='white')
-                ),
-                text=labels,
-                hovertemplate=(
-                    f"<b>%{{text}}</b><br>"
-                    f"{x_key}: %{{x}}<br>"
-                    f"{y_key}: %{{y}}<br>"
-                    f"{size_key}: %{{marker.size}}<br>"
-                    f"{color_key}: %{{marker.color:.2f}}<extra></extra>"
-                )
-            )
-        )
+        def build():
+            return _build_bubble_figure(data, x_key, y_key, size_key, color_key, label_key, title,
+                                        x_id, y_id, size_id, color_id)
 
-        fig.update_layout(
-            title=dict(
-                text=title or "",
-                x=0.5,
-                xanchor="center",
-                yanchor="top",
-                pad=dict(t=10, b=10)
-            ),
-            height=600,
-            margin=dict(t=60, b=40, l=50, r=30),
-            showlegend=False,
-            plot_bgcolor='white',
-            xaxis=dict(title=None, range=x_range),
-            yaxis=dict(title=None, range=y_range)
-        )
+        if cache_key is not None:
+            variant = (x_key, y_key, size_key, color_key, label_key, title)
+            figure = figure_cache.get_or_build(selection_key("bubble", *cache_key, variant=variant), build)
+        else:
+            figure = build()
 
     return dcc.Graph(
         id=chart_id,
-        figure=fig,
+        figure=figure,
         config={'displayModeBar': False}
     )
 
 
+def _build_bubble_figure(data, x_key, y_key, size_key, color_key, label_key, title,
+                         x_id, y_id, size_id, color_id):
+    # Extract values
+    x_vals = [d[x_key] for d in data]
+    y_vals = [d[y_key] for d in data]
+    sizes = [d[size_key] for d in data]
+    colors = [d[color_key] for d in data]
+    labels = [d[label_key] for d in data]
+
+    # Get fixed ranges
+    x_range = get_scale_range(x_id)
+    y_range = get_scale_range(y_id)
+    size_range = get_scale_range(size_id)
+    color_range = get_scale_range(color_id)
+
+    # Fallbacks if size_range not available
+    max_size = max(sizes) if sizes else 1
+    sizeref = 2. * max_size / (100. ** 2)
+
+    if size_range:
+        sizeref = 2. * size_range[1] / (100. ** 2)
+
+    marker = dict(
+        size=sizes,
+        color=colors,
+        colorscale=[
+            [0.0, "#b6d6f4"],
+            [0.5, "#a8d1f8"],
+            [1.0, "#084594"]
+        ],
+        colorbar=dict(title=dict(text="")),
+        showscale=True,
+        sizemode='area',
+        sizeref=sizeref,
+        sizemin=4,
+        line=dict(width=0.5, color='white')
+    )
+    if color_range:
+        marker["cmin"], marker["cmax"] = color_range
+
+    trace = dict(
+        type='scatter',
+        x=x_vals,
+        y=y_vals,
+        mode='markers',
+        marker=marker,
+        text=labels,
+        hovertemplate=(
+            f"<b>%{{text}}</b><br>"
+            f"{x_key}: %{{x}}<br>"
+            f"{y_key}: %{{y}}<br>"
+            f"{size_key}: %{{marker.size}}<br>"
+            f"{color_key}: %{{marker.color:.2f}}<extra></extra>"
+        )
+    )
+
+    layout = dict(_BUBBLE_LAYOUT)
+    layout["title"] = dict(
+        text=title or "",
+        x=0.5,
+        xanchor="center",
+        yanchor="top",
+        pad=dict(t=10, b=10)
+    )
+    layout["xaxis"] = dict(title=dict(text=None))
+    layout["yaxis"] = dict(title=dict(text=None))
+    if x_range:
+        layout["xaxis"]["range"] = x_range
+    if y_range:
+        layout["yaxis"]["range"] = y_range
+
+    return {"data": [trace], "layout": layout}
+
+
 # Legend Renderer
 def render_bubble_with_legend(chart_id, data, x_key, y_key, size_key, color_key, label_key, title=None,
-                               x_id=None, y_id=None, size_id=None, color_id=None):
+                               x_id=None, y_id=None, size_id=None, color_id=None, cache_key=None):
     chart = BubbleChartComponent(
         chart_id=chart_id,
         data=data,
@@ -101,7 +123,8 @@ def render_bubble_with_legend(chart_id, data, x_key, y_key, size_key, color_key,
         x_id=x_id,
         y_id=y_id,
         size_id=size_id,
-        color_id=color_id
+        color_id=color_id,
+        cache_key=cache_key
     )
 
     legend = html.Div([
@@ -0,0 +1,129 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+
+import plotly.graph_objects as go
+
+
+# === Figure Cache ===
+class FigureCache:
+    """LRU cache of ready-to-render figure dicts keyed by component and selection.
+
+    Keys look like ``(component, indicator_ids, category, state, rounds,
+    data_version, variant)``, where ``data_version`` is the API's stamp of the
+    tables the figure was built from, so reloaded data never hits an old
+    figure. The values are plain figure dicts that ``dcc.Graph`` can serialise
+    directly, so a hit skips all Plotly object construction.
+    """
+
+    def __init__(self, max_entries=256, ttl=1800):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key, builder):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (not self.ttl or now - entry[0] < self.ttl):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        figure = builder()
+
+        with self._lock:
+            self._entries[key] = (now, figure)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return figure
+
+    def figures_for_selection(self, indicator_ids, category, state, rounds=None, data_version=None):
+        """Return ``[(key, figure)]`` for every live cached figure of a selection.
+
+        ``rounds`` and ``data_version`` narrow the match when given.
+        """
+        indicator_ids = set(indicator_ids or [])
+        rounds = _rounds_key(rounds)
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (key, entry[1]) for key, entry in self._entries.items()
+                if (not self.ttl or now - entry[0] < self.ttl)
+                and key[2] == category and key[3] == state and indicator_ids.issuperset(key[1])
+                and (rounds is None or key[4] == rounds)
+                and (data_version is None or key[5] == data_version)
+            ]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / total) if total else 0.0
+            }
+
+
+figure_cache = FigureCache(
+    max_entries=int(os.environ.get("FIGURE_CACHE_SIZE", 256)),
+    ttl=float(os.environ.get("FIGURE_CACHE_TTL", 1800))
+)
+
+
+def _rounds_key(rounds):
+    return tuple(sorted(rounds)) if rounds else None
+
+
+def selection_key(component, indicator_ids, category, state, rounds=None, data_version=None, variant=None):
+    """Build a cache key; indicator ids and rounds are normalised to tuples."""
+    if isinstance(indicator_ids, (list, tuple, set)):
+        indicator_ids = tuple(indicator_ids)
+    else:
+        indicator_ids = (indicator_ids,)
+    return (component, indicator_ids, category, state, _rounds_key(rounds), data_version, variant)
+
+
+# === Layout Skeletons ===
+def layout_skeleton(**layout):
+    """Resolve a layout (including its template) to a plain dict once."""
+    return go.Figure(layout=layout).to_dict()["layout"]
+
+
+def empty_figure(message="No data available"):
+    return {"data": [], "layout": _with_message(message)}
+
+
+def _with_message(message):
+    layout = dict(_EMPTY_LAYOUT)
+    layout["annotations"] = [dict(_EMPTY_LAYOUT["annotations"][0], text=message)]
+    return layout
+
+
+_EMPTY_LAYOUT = layout_skeleton(
+    title="No Data Available",
+    template="plotly_white",
+    height=400,
+    annotations=[
+        dict(
+            text="No data available",
+            xref="paper", yref="paper",
+            x=0.5, y=0.5,
+            xanchor='center', yanchor='middle',
+            showarrow=False,
+            font=dict(size=16, color="gray")
+        )
+    ]
+)
@@ -0,0 +1,107 @@
+import base64
+import hashlib
+import io
+import json
+import os
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from src.components.plots.figure_cache import FigureCache, figure_cache
+
+EXPORT_FORMATS = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+    "pdf": "application/pdf"
+}
+
+# Rendered bytes, keyed by a hash of the selection's figure keys and format
+export_cache = FigureCache(
+    max_entries=int(os.environ.get("FIGURE_EXPORT_CACHE_SIZE", 64)),
+    ttl=float(os.environ.get("FIGURE_CACHE_TTL", 1800))
+)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class FigureExportError(RuntimeError):
+    """Raised when figures cannot be rendered to static images."""
+
+
+def _get_executor():
+    # Threads: kaleido renders in its own subprocess, so the figures (GeoJSON
+    # included) need not be pickled to another process. Created lazily so
+    # forked Dash workers each own their pool
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=int(os.environ.get("FIGURE_EXPORT_WORKERS", 2)),
+                                           thread_name_prefix="figure-export")
+        return _executor
+
+
+def _render(figure, fmt, scale):
+    import plotly.io as pio  # kaleido is only needed when exporting
+    return pio.to_image(figure, format=fmt, scale=scale)
+
+
+def selection_hash(keys, fmt, scale=1):
+    payload = json.dumps([sorted(map(repr, keys)), fmt, scale])
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def render_figures(figures, fmt="png", scale=1):
+    """Render figure dicts to image bytes in the export threads, preserving order."""
+    if fmt not in EXPORT_FORMATS:
+        raise FigureExportError(f"Unsupported export format: {fmt}")
+    try:
+        futures = [_get_executor().submit(_render, figure, fmt, scale) for figure in figures]
+        return [future.result() for future in futures]
+    except ImportError as e:
+        raise FigureExportError("Static export requires the 'kaleido' package") from e
+    except Exception as e:
+        raise FigureExportError(f"Figure rendering failed: {e}") from e
+
+
+def render_image(key, figure, fmt="png", scale=1):
+    """Render one cached figure to bytes, memoised by its cache key."""
+    return export_cache.get_or_build(
+        ("image", selection_hash([key], fmt, scale)),
+        lambda: render_figures([figure], fmt, scale)[0]
+    )
+
+
+def image_data_uri(key, figure, fmt="png", scale=1):
+    encoded = base64.b64encode(render_image(key, figure, fmt, scale)).decode("ascii")
+    return f"data:{EXPORT_FORMATS[fmt]};base64,{encoded}"
+
+
+def export_selection(indicator_ids, category, state, fmt="png", scale=2,
+                     rounds=None, data_version=None, rebuild=None):
+    """Zip every cached figure of a selection rendered to ``fmt``.
+
+    When nothing is cached for the selection (it was drawn by another worker,
+    or has expired), ``rebuild()`` is called to build its figures into the
+    figure cache first. Returns ``(filename, zip_bytes)``, or ``None`` if
+    there is still nothing to export.
+    """
+    items = figure_cache.figures_for_selection(indicator_ids, category, state, rounds, data_version)
+    if not items and rebuild is not None:
+        rebuild()
+        items = figure_cache.figures_for_selection(indicator_ids, category, state, rounds, data_version)
+    if not items:
+        return None
+
+    digest = selection_hash([key for key, _ in items], fmt, scale)
+
+    def build():
+        images = render_figures([figure for _, figure in items], fmt, scale)
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            for (key, _), image in zip(items, images):
+                component, ids = key[0], "-".join(str(i) for i in key[1])
+                archive.writestr(f"{component}-{ids}-{hashlib.sha1(repr(key).encode()).hexdigest()[:8]}.{fmt}", image)
+        return buffer.getvalue()
+
+    return f"figures-{digest[:10]}.zip", export_cache.get_or_build(("zip", digest), build)
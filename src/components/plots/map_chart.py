@@ -1,19 +1,32 @@
 import json
+import logging
+import math
 import os
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objs as go
-from dash import dcc
+from dash import dcc, html
 import textwrap
-from src.data.scale_helper import get_scale_range  
+from src.data.scale_helper import get_scale_range
+from src.components.plots.figure_cache import figure_cache, selection_key, layout_skeleton, empty_figure
+from src.components.plots.figure_export import image_data_uri, FigureExportError
+
+logger = logging.getLogger(__name__)
 
 # === Load GeoJSON Files ===
-GEOJSON_BASE = os.path.join(os.path.dirname(__file__), '..', '..', 'data')
+GEOJSON_BASE = os.environ.get("GEOJSON_DIR", os.path.join(os.path.dirname(__file__), '..', '..', 'data'))
 with open(os.path.join(GEOJSON_BASE, "NFHS5_statefiles.geojson"), "r", encoding="utf-8") as f:
     state_geojson = json.load(f)
 with open(os.path.join(GEOJSON_BASE, "NFHS5_districtlevel.geojson"), "r", encoding="utf-8") as f:
     district_geojson = json.load(f)
 
+# Pre-built layout shared by every map; only title and mapbox view vary
+_MAP_LAYOUT = layout_skeleton(
+    margin={"r": 0, "t": 80, "l": 0, "b": 0},
+    height=500,
+    legend=dict(tracegroupgap=0),
+)
+
+# Default color scale
+_DEFAULT_COLORSCALE = [[0.0, "#b6d6f4"], [0.5, "#a8d1f8"], [1.0, "#084594"]]
+
 # === MapChartComponent ===
 def MapChartComponent(
     chart_id,
@@ -26,103 +39,109 @@ def MapChartComponent(
     title="Map",
     center=None,
     colorscale=None,
-    indicator_id=None
+    indicator_id=None,
+    cache_key=None,
+    static=False       # send a rendered PNG instead of the geometry-laden figure
 ):
     if not data:
         return _empty_map(chart_id, "No data available")
 
-    # Build a DataFrame so px.express doesn't need to import pandas
-    df = pd.DataFrame(data)
+    def build():
+        return _build_map_figure(data, geojson, location_key, feature_id_key, value_key,
+                                 label_key, title, center, colorscale, indicator_id)
+
+    key = selection_key("map", *cache_key, variant=title) if cache_key is not None else None
+    figure = figure_cache.get_or_build(key, build) if key is not None else build()
 
-    # Replace invalid values
-    df[value_key] = pd.to_numeric(df[value_key], errors="coerce")
+    if static and key is not None:
+        try:
+            return html.Img(
+                id=chart_id,
+                src=image_data_uri(key, figure, "png"),
+                style={"width": "100%", "height": "auto"}
+            )
+        except FigureExportError as e:
+            logger.warning("Static render failed, sending interactive map: %s", e)
+
+    return dcc.Graph(
+        id=chart_id,
+        figure=figure,
+        config={"displayModeBar": False}
+    )
+
+
+def _to_number(value):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(number) else number
+
+
+def _build_map_figure(data, geojson, location_key, feature_id_key, value_key,
+                      label_key, title, center, colorscale, indicator_id):
+    locations = [row.get(location_key) for row in data]
+    values = [_to_number(row.get(value_key)) for row in data]
 
     # Determine color range
     scale_range = get_scale_range(indicator_id)
     if scale_range:
         range_color = tuple(scale_range)
     else:
-        v = df[value_key].dropna()
-        range_color = (float(v.min()), float(v.max())) if not v.empty else (0, 100)
+        v = [x for x in values if x is not None]
+        range_color = (min(v), max(v)) if v else (0, 100)
 
     # Prepare hover text
-    df["hover_text"] = df.apply(
-        lambda row: f"{row[label_key]}<br>Value: {row[value_key]:.1f}"
-                    if pd.notna(row[value_key])
-                    else f"{row[label_key]}<br>Value: NA",
-        axis=1
-    )
-
-    # Default color scale
-    if colorscale is None:
-        colorscale = [[0.0, "#b6d6f4"], [0.5, "#a8d1f8"], [1.0, "#084594"]]
+    hover_text = [
+        [f"{row.get(label_key)}<br>Value: {value:.1f}" if value is not None
+         else f"{row.get(label_key)}<br>Value: NA"]
+        for row, value in zip(data, values)
+    ]
 
     # Zoom logic
     zoom = 5 if center and center != {"lat": 22, "lon": 80} else 3
 
-    # Create the figure, passing in the DataFrame explicitly
-    fig = px.choropleth_mapbox(
-        df,                              # <— pass the DataFrame here
+    trace = dict(
+        type="choroplethmapbox",
         geojson=geojson,
-        locations=location_key,
+        locations=locations,
         featureidkey=feature_id_key,
-        color=value_key,
-        color_continuous_scale=colorscale,
-        range_color=range_color,
-        mapbox_style="carto-positron",
-        center=center or {"lat": 22, "lon": 80},
-        zoom=zoom,
-        hover_data=["hover_text"],       # use our hover_text column
-    )
-
-    # Use our hover_text column as the sole hover template
-    fig.update_traces(
+        z=values,
+        coloraxis="coloraxis",
+        customdata=hover_text,
         hovertemplate="%{customdata[0]}<extra></extra>",
-        customdata=df[["hover_text"]].values,
-        marker_line_color="black",
-        marker_line_width=0.5,
+        marker=dict(line=dict(color="black", width=0.5)),
+        name="",
+        subplot="mapbox"
     )
 
-    # Layout tweaks
-    fig.update_layout(
-        title=dict(
-            text="<br>".join(textwrap.wrap(title, width=50)),
-            x=0.5,
-            xanchor="center",
-            font=dict(size=14),
-            y=0.95
-        ),
-        margin={"r": 0, "t": 80, "l": 0, "b": 0},
-        height=500,
+    layout = dict(_MAP_LAYOUT)
+    layout["title"] = dict(
+        text="<br>".join(textwrap.wrap(title, width=50)),
+        x=0.5,
+        xanchor="center",
+        font=dict(size=14),
+        y=0.95
     )
-
-    return dcc.Graph(
-        id=chart_id,
-        figure=fig,
-        config={"displayModeBar": False}
+    layout["coloraxis"] = dict(
+        colorscale=colorscale or _DEFAULT_COLORSCALE,
+        cmin=range_color[0],
+        cmax=range_color[1],
+        colorbar=dict(title=dict(text=value_key))
     )
+    layout["mapbox"] = dict(
+        style="carto-positron",
+        center=center or {"lat": 22, "lon": 80},
+        zoom=zoom,
+        domain=dict(x=[0.0, 1.0], y=[0.0, 1.0])
+    )
+
+    return {"data": [trace], "layout": layout}
 
 
 def _empty_map(chart_id, message):
     return dcc.Graph(
         id=chart_id,
-        figure=go.Figure(
-            layout=go.Layout(
-                title="No Data Available",
-                template="plotly_white",
-                height=400,
-                annotations=[{
-                    "text": message,
-                    "xref": "paper",
-                    "yref": "paper",
-                    "x": 0.5,
-                    "y": 0.5,
-                    "xanchor": "center",
-                    "yanchor": "middle",
-                    "showarrow": False,
-                    "font": {"size": 16, "color": "gray"}
-                }]
-            )
-        ),
+        figure=empty_figure(message),
         config={"displayModeBar": False}
     )
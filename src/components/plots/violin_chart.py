@@ -1,13 +1,29 @@
-import plotly.graph_objs as go
 from dash import dcc, html
 from typing import List
 import textwrap
 from src.data.scale_helper import get_scale_range
+from src.components.plots.figure_cache import figure_cache, selection_key, layout_skeleton, empty_figure
+
+# Pre-built layout shared by every violin chart; only title and y-range vary
+_VIOLIN_LAYOUT = layout_skeleton(
+    xaxis=dict(
+        title="",
+        showgrid=False,
+        showticklabels=False,
+        zeroline=False
+    ),
+    template="plotly_white",
+    height=450,
+    margin=dict(t=60, l=70, r=30, b=60),
+    plot_bgcolor='rgba(0,0,0,0)',
+    paper_bgcolor='rgba(0,0,0,0)',
+    showlegend=False
+)
+
+def ViolinChartComponent(chart_id, x_data, y_data, title="Violin Chart",
+                         indicator_type="Neutral", show_points=True,
+                         color_scheme="default", indicator_id=None, cache_key=None):
 
-def ViolinChartComponent(chart_id, x_data, y_data, title="Violin Chart", 
-                         indicator_type="Neutral", show_points=True, 
-                         color_scheme="default", indicator_id=None):
-    
     if not x_data or not y_data or len(x_data) != len(y_data):
         return _empty_graph(chart_id, "No data to display")
 
@@ -25,6 +41,23 @@ def ViolinChartComponent(chart_id, x_data, y_data, title="Violin Chart",
     if not valid_y:
         return _empty_graph(chart_id, "No valid numeric data")
 
+    def build():
+        return _build_violin_figure(valid_x, valid_y, title, indicator_type, show_points, indicator_id)
+
+    if cache_key is not None:
+        figure = figure_cache.get_or_build(selection_key("violin", *cache_key, variant=title), build)
+    else:
+        figure = build()
+
+    return dcc.Graph(
+        id=chart_id,
+        figure=figure,
+        config={'displayModeBar': False}
+    )
+
+
+def _build_violin_figure(valid_x, valid_y, title, indicator_type, show_points, indicator_id):
+
     def get_point_colors(values, indicator_type):
         colors = []
         for val in values:
@@ -46,12 +79,13 @@ def ViolinChartComponent(chart_id, x_data, y_data, title="Violin Chart",
                 colors.append('#6c757d')
         return colors
 
-    violin_trace = go.Violin(
+    violin_trace = dict(
+        type='violin',
         x=[''] * len(valid_y),
         y=valid_y,
-        box_visible=True,
-        meanline_visible=True,
-        line_color='#003a5d',
+        box=dict(visible=True),
+        meanline=dict(visible=True),
+        line=dict(color='#003a5d'),
         fillcolor='rgba(0, 102, 204, 0.3)',
         opacity=0.7,
         name='Distribution',
@@ -63,7 +97,8 @@ def ViolinChartComponent(chart_id, x_data, y_data, title="Violin Chart",
 
     if show_points:
         point_colors = get_point_colors(valid_y, indicator_type)
-        scatter_trace = go.Scatter(
+        scatter_trace = dict(
+            type='scatter',
             x=[''] * len(valid_y),
             y=valid_y,
             mode='markers',
@@ -83,62 +118,28 @@ def ViolinChartComponent(chart_id, x_data, y_data, title="Violin Chart",
     # Get fixed y-axis scale
     y_range = get_scale_range(indicator_id) if indicator_id else None
 
-    fig = go.Figure(data=traces)
-    fig.update_layout(
-        title=dict(
-            text="<br>".join(textwrap.wrap(title, width=50)),
-            x=0.5,
-            xanchor='center',
-            font=dict(size=16, color='#2c3e50'),
-            y=0.95
-        ),
-        xaxis=dict(
-            title="",
-            showgrid=False,
-            showticklabels=False,
-            zeroline=False
-        ),
-        yaxis=dict(
-            title="Value",
-            range=y_range,
-            showgrid=True,
-            gridcolor='rgba(128, 128, 128, 0.2)',
-            title_font=dict(size=12, color='#2c3e50')
-        ),
-        template="plotly_white",
-        height=450,
-        margin=dict(t=60, l=70, r=30, b=60),
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        showlegend=False
+    layout = dict(_VIOLIN_LAYOUT)
+    layout["title"] = dict(
+        text="<br>".join(textwrap.wrap(title, width=50)),
+        x=0.5,
+        xanchor='center',
+        font=dict(size=16, color='#2c3e50'),
+        y=0.95
     )
-
-    return dcc.Graph(
-        id=chart_id,
-        figure=fig,
-        config={'displayModeBar': False}
+    layout["yaxis"] = dict(
+        title=dict(text="Value", font=dict(size=12, color='#2c3e50')),
+        showgrid=True,
+        gridcolor='rgba(128, 128, 128, 0.2)'
     )
+    if y_range:
+        layout["yaxis"]["range"] = y_range
+
+    return {"data": traces, "layout": layout}
 
 
 def _empty_graph(chart_id, message):
     return dcc.Graph(
         id=chart_id,
-        figure=go.Figure(
-            layout=go.Layout(
-                title="No Data Available",
-                template="plotly_white",
-                height=400,
-                annotations=[
-                    dict(
-                        text=message,
-                        xref="paper", yref="paper",
-                        x=0.5, y=0.5,
-                        xanchor='center', yanchor='middle',
-                        showarrow=False,
-                        font=dict(size=16, color="gray")
-                    )
-                ]
-            )
-        ),
+        figure=empty_figure(message),
         config={'displayModeBar': False}
     )
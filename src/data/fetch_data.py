@@ -1,6 +1,7 @@
+import os
 import requests
 
-BASE_URL = "http://localhost:8000"
+BASE_URL = os.environ.get("API_BASE_URL", "http://localhost:8000")
 
 def fetch_states():
     try:
@@ -18,6 +19,15 @@ def fetch_categories():
     except:
         return 
 
+def fetch_category_indicators():
+    """Category -> indicator options; None when the API cannot be reached, so callers can retry."""
+    try:
+        response = requests.get(f"{BASE_URL}/categoryIndicators", timeout=10)
+        response.raise_for_status()
+        return response.json().get("category_indicators", {})
+    except requests.RequestException:
+        return None
+
 
 # def fetch_districts():
 #     try:
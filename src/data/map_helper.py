@@ -1,6 +1,10 @@
+import logging
+
 from shapely.geometry import shape
 from shapely.ops import unary_union
 
+logger = logging.getLogger(__name__)
+
 def filter_geojson_by_district_ids(geojson, district_ids):
     return {
         "type": "FeatureCollection",
@@ -36,5 +40,5 @@ def compute_geojson_center(geojson):
 
         return {"lat": centroid.y, "lon": centroid.x}
     except Exception as e:
-        print(f"[map_helper.py] Error computing centroid: {e}")
+        logger.warning("Error computing centroid: %s", e)
         return {"lat": 22, "lon": 80}
@@ -0,0 +1,403 @@
+"""Load a new NFHS round from the published factsheet tables.
+
+    python -m src.data.nfhs_loader --database-url postgresql+asyncpg://... \\
+        --round "NFHS-6" states.xlsx districts.csv [--replace] [--skip-unknown] [--dry-run]
+
+Each input file (CSV, or the first sheet of an .xlsx workbook) has one row
+per region and indicator. Headers are matched loosely (case, spacing and
+punctuation are ignored):
+
+    state, district (blank or absent for state rows), indicator (name or id),
+    category (optional, name or id), st, non_st, total,
+    national_average / state_average (optional)
+
+Region and indicator names are normalised and mapped to the ids in States,
+Districts and Indicators. When there is no category column, the category an
+indicator already has in earlier rounds is used. Values are validated as
+numbers; "NA", "-", "*" and blanks are stored as "NA" like the existing
+rows, and factsheet parentheses (small-sample estimates) are dropped. All
+problems are collected and reported together before anything is written.
+
+Averages the input does not give are derived per indicator, as
+src.data.synthetic_nfhs generates them and the API reads them ("State
+Average" / "National Average" in /indicator-stats):
+
+    st_avg_total  (district rows) = total of the district's state row
+    nat_avg_total (state rows)    = total of the India row, else the
+                                    unweighted mean of the numeric state totals
+
+All rows are written in one transaction. On Postgres they go through
+asyncpg's binary COPY; on other databases they are batched INSERTs. A
+failure leaves the database untouched. Afterwards the loader runs ANALYZE
+and refreshes any materialized views. Running API workers notice the new
+data version within DATA_VERSION_TTL seconds and reload their category
+options and round list; dashboard workers keep their category dropdowns until
+restarted. The loader prints a reminder.
+"""
+import argparse
+import asyncio
+import csv
+import decimal
+import json
+import os
+import re
+import sys
+import time
+import unicodedata
+
+from sqlalchemy import delete, func, insert, select, text
+
+from models.sqlalchemy_models import (
+    Category, District, Indicator, NFHSDistrictData, NFHSRound, NFHSStateData, State
+)
+from storage_backend import create_database_engine
+
+BATCH_SIZE = 10000
+
+RELOAD_NOTICE = ("Running API workers pick up the new data within DATA_VERSION_TTL seconds (default 30); "
+                 "send SIGHUP to the serve.py master to reload them now, and restart the dashboard "
+                 "for new indicators to appear in its dropdowns.")
+
+HEADER_ALIASES = {
+    "state": "state", "state_name": "state", "state_ut": "state", "states_uts": "state",
+    "district": "district", "district_name": "district",
+    "indicator": "indicator", "indicator_name": "indicator", "indicator_id": "indicator",
+    "category": "category", "category_id": "category", "categories_id": "category",
+    "st": "st", "non_st": "non_st", "nonst": "non_st", "total": "total",
+    "national_average": "nat_avg_total", "nat_avg_total": "nat_avg_total", "india": "nat_avg_total",
+    "state_average": "st_avg_total", "st_avg_total": "st_avg_total",
+}
+REQUIRED_HEADERS = {"state", "indicator", "total"}
+MISSING_VALUES = {"", "na", "n.a.", "n/a", "-", "*", "nan"}
+# Stored for missing values, as in the rows already in the tables
+NA = "NA"
+
+# Rows for the whole country carry the national values
+NATIONAL_NAMES = {"india", "all india"}
+
+# Older spellings still found in published tables
+NAME_ALIASES = {
+    "orissa": "odisha",
+    "pondicherry": "puducherry",
+    "uttaranchal": "uttarakhand",
+    "nct of delhi": "delhi",
+}
+
+
+class ValidationErrors(Exception):
+    def __init__(self, problems):
+        self.problems = problems
+        super().__init__(f"{len(problems)} problems in the input")
+
+
+class _DryRun(Exception):
+    """Raised inside the transaction to roll back a --dry-run."""
+
+
+# === Reading and normalising ===
+def normalise_header(header):
+    return re.sub(r"[^a-z0-9]+", "_", str(header or "").strip().lower()).strip("_")
+
+
+def normalise_name(name):
+    name = unicodedata.normalize("NFKC", str(name or "")).casefold().replace("&", " and ")
+    name = re.sub(r"[^\w\s]", " ", name)
+    name = " ".join(name.split())
+    return NAME_ALIASES.get(name, name)
+
+
+def normalise_value(value):
+    """Number as text (the value columns are strings), "NA" for missing; raises ValueError otherwise."""
+    if value is None:
+        return NA
+    text_value = str(value).strip().replace(",", "").rstrip("%").strip()
+    if text_value.lower() in MISSING_VALUES:
+        return NA
+    if text_value.startswith("(") and text_value.endswith(")"):
+        text_value = text_value[1:-1].strip()
+    float(text_value)
+    return text_value
+
+
+def read_cells(path):
+    if path.lower().endswith((".xlsx", ".xlsm")):
+        from openpyxl import load_workbook  # only needed for Excel input
+
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            yield from workbook.worksheets[0].iter_rows(values_only=True)
+        finally:
+            workbook.close()
+    else:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            yield from csv.reader(f)
+
+
+def read_rows(path):
+    """Yield (line number, {canonical header: cell}) for a CSV or .xlsx file."""
+    rows = read_cells(path)
+    headers = [HEADER_ALIASES.get(normalise_header(h)) for h in next(rows, [])]
+    missing = REQUIRED_HEADERS - set(headers)
+    if missing:
+        raise ValidationErrors([f"{path}: missing columns {', '.join(sorted(missing))}"])
+
+    for line, cells in enumerate(rows, start=2):
+        if not any(cell not in (None, "") for cell in cells):
+            continue
+        yield line, {h: cell for h, cell in zip(headers, cells) if h is not None}
+
+
+# === Mapping to ids ===
+class ReferenceData:
+    """Name -> id lookups for states, districts, indicators and categories."""
+
+    def __init__(self, states, districts, indicators, categories, indicator_categories):
+        self.states = {normalise_name(name): int(sid) for sid, name in states}
+        self.districts = {(int(sid), normalise_name(name)): int(did) for did, sid, name in districts}
+        self.indicators = {normalise_name(name): int(iid) for iid, name in indicators}
+        self.indicator_ids = set(self.indicators.values())
+        self.categories = {normalise_name(name): int(cid) for cid, name in categories}
+        self.category_ids = set(self.categories.values())
+        self.indicator_categories = {int(iid): int(cid) for iid, cid in indicator_categories if cid is not None}
+
+    @classmethod
+    async def load(cls, conn):
+        async def rows(stmt):
+            return (await conn.execute(stmt)).all()
+
+        return cls(
+            await rows(select(State.state_id, State.state_name)),
+            await rows(select(District.district_id, District.state_id, District.district_name)),
+            await rows(select(Indicator.indicator_id, Indicator.indicator_name)),
+            await rows(select(Category.categories_id, Category.categories)),
+            await rows(select(NFHSStateData.indicator_id, NFHSStateData.categories_id).distinct()),
+        )
+
+    def indicator(self, value):
+        if isinstance(value, (int, float)) or str(value).strip().isdigit():
+            indicator_id = int(float(value))
+            return indicator_id if indicator_id in self.indicator_ids else None
+        return self.indicators.get(normalise_name(value))
+
+    def category(self, value, indicator_id):
+        if value in (None, ""):
+            return self.indicator_categories.get(indicator_id)
+        if isinstance(value, (int, float)) or str(value).strip().isdigit():
+            category_id = int(float(value))
+            return category_id if category_id in self.category_ids else None
+        return self.categories.get(normalise_name(value))
+
+
+def build_records(paths, reference, skip_unknown=False):
+    """Validate every input row; returns (state rows, district rows) as column dicts."""
+    state_rows, district_rows, problems = [], [], []
+    national = {}
+    seen = set()
+
+    for path in paths:
+        for line, row in read_rows(path):
+            where = f"{os.path.basename(path)}:{line}"
+            row_problems = []
+
+            if normalise_name(row.get("state")) in NATIONAL_NAMES and row.get("district") in (None, ""):
+                indicator_id = reference.indicator(row.get("indicator"))
+                try:
+                    if indicator_id is not None:
+                        national[indicator_id] = normalise_value(row.get("total"))
+                except ValueError:
+                    problems.append(f"{where}: total is not a number: {row.get('total')!r}")
+                continue
+
+            state_id = reference.states.get(normalise_name(row.get("state")))
+            if state_id is None:
+                row_problems.append(f"unknown state {row.get('state')!r}")
+
+            district_id = None
+            if row.get("district") not in (None, "") and state_id is not None:
+                district_id = reference.districts.get((state_id, normalise_name(row["district"])))
+                if district_id is None:
+                    row_problems.append(f"unknown district {row['district']!r} in {row.get('state')!r}")
+
+            indicator_id = reference.indicator(row.get("indicator"))
+            if indicator_id is None:
+                row_problems.append(f"unknown indicator {row.get('indicator')!r}")
+            categories_id = reference.category(row.get("category"), indicator_id)
+            if categories_id is None and indicator_id is not None:
+                row_problems.append(f"no category for indicator {row.get('indicator')!r}")
+
+            values = {}
+            for column in ("st", "non_st", "total", "nat_avg_total", "st_avg_total"):
+                try:
+                    values[column] = normalise_value(row.get(column))
+                except ValueError:
+                    problems.append(f"{where}: {column} is not a number: {row.get(column)!r}")
+
+            if row_problems:
+                if not skip_unknown:
+                    problems.extend(f"{where}: {p}" for p in row_problems)
+                continue
+
+            key = (district_id or state_id, district_id is not None, indicator_id)
+            if key in seen:
+                problems.append(f"{where}: duplicate row for this region and indicator")
+                continue
+            seen.add(key)
+
+            common = {"state_id": state_id, "indicator_id": indicator_id, "categories_id": categories_id,
+                      "st": values.get("st", NA), "non_st": values.get("non_st", NA),
+                      "total": values.get("total", NA)}
+            if district_id is None:
+                state_rows.append(dict(common, nat_avg_total=values.get("nat_avg_total")))
+            else:
+                district_rows.append(dict(common, district_id=district_id, st_avg_total=values.get("st_avg_total")))
+
+    if problems:
+        raise ValidationErrors(problems)
+
+    # Fill the stored averages the tables do not give (formulas in the module docstring)
+    state_totals, numeric_totals = {}, {}
+    for r in state_rows:
+        state_totals[(r["state_id"], r["indicator_id"])] = r["total"]
+        if r["total"] != NA:
+            numeric_totals.setdefault(r["indicator_id"], []).append(float(r["total"]))
+    for r in state_rows:
+        if r["nat_avg_total"] in (None, NA):
+            national_total = national.get(r["indicator_id"], NA)
+            totals = numeric_totals.get(r["indicator_id"])
+            if national_total == NA and totals:
+                national_total = f"{sum(totals) / len(totals):.1f}"
+            r["nat_avg_total"] = national_total
+    for r in district_rows:
+        if r["st_avg_total"] in (None, NA):
+            r["st_avg_total"] = state_totals.get((r["state_id"], r["indicator_id"]), NA)
+    return state_rows, district_rows
+
+
+# === Writing ===
+async def bulk_write(conn, model, rows, postgres, batch_size=BATCH_SIZE):
+    table = model.__table__
+    if not rows:
+        return
+    if not postgres:
+        for start in range(0, len(rows), batch_size):
+            await conn.execute(insert(table), rows[start:start + batch_size])
+        return
+
+    columns = [c.name for c in table.columns]
+    numeric = {c.name for c in table.columns if c.type.python_type is decimal.Decimal}
+    raw = (await conn.get_raw_connection()).driver_connection
+    for start in range(0, len(rows), batch_size):
+        records = [tuple(decimal.Decimal(row[c]) if c in numeric and row[c] is not None else row[c]
+                         for c in columns)
+                   for row in rows[start:start + batch_size]]
+        await raw.copy_records_to_table(table.name, records=records, columns=columns)
+
+
+async def refresh_derived(conn):
+    await conn.execute(text(f'ANALYZE "{NFHSStateData.__tablename__}"'))
+    await conn.execute(text(f'ANALYZE "{NFHSDistrictData.__tablename__}"'))
+    views = (await conn.execute(text(
+        "SELECT format('%I.%I', schemaname, matviewname) FROM pg_matviews"))).scalars().all()
+    for view in views:
+        await conn.execute(text(f"REFRESH MATERIALIZED VIEW {view}"))
+    return views
+
+
+async def load_round(args):
+    engine = create_database_engine(args.database_url)
+    postgres = engine.dialect.name == "postgresql"
+    timings = {}
+    started = time.perf_counter()
+
+    try:
+        async with engine.begin() as conn:
+            if postgres:
+                # Serialise concurrent loads; readers are not blocked
+                await conn.execute(text(
+                    'LOCK TABLE "NFHS_State_Data", "NFHS_District_Data", "NFHS_Rounds" IN SHARE ROW EXCLUSIVE MODE'))
+
+            reference = await ReferenceData.load(conn)
+            state_rows, district_rows = build_records(args.files, reference, args.skip_unknown)
+            timings["validate"] = time.perf_counter() - started
+
+            round_id = (await conn.execute(
+                select(NFHSRound.nfhs_id).where(NFHSRound.nfhs_round == args.round))).scalar()
+            if round_id is None:
+                round_id = ((await conn.execute(select(func.max(NFHSRound.nfhs_id)))).scalar() or 0) + 1
+                await conn.execute(insert(NFHSRound.__table__), [{"nfhs_id": round_id, "nfhs_round": args.round}])
+            round_id = int(round_id)
+
+            for model, rows in ((NFHSStateData, state_rows), (NFHSDistrictData, district_rows)):
+                # A state-only or district-only file leaves the other table's round untouched
+                if not rows:
+                    continue
+                existing = (await conn.execute(
+                    select(func.count()).select_from(model).where(model.nfhs_id == round_id))).scalar()
+                if existing and not args.replace:
+                    raise SystemExit(f"{model.__tablename__} already has {existing} rows for {args.round}; "
+                                     "use --replace")
+                if existing:
+                    await conn.execute(delete(model).where(model.nfhs_id == round_id))
+
+                next_id = int((await conn.execute(select(func.max(model.data_id)))).scalar() or 0) + 1
+                for offset, row in enumerate(rows):
+                    row["data_id"] = next_id + offset
+                    row["nfhs_id"] = round_id
+
+            if args.dry_run:
+                raise _DryRun()
+
+            write_started = time.perf_counter()
+            await bulk_write(conn, NFHSStateData, state_rows, postgres)
+            await bulk_write(conn, NFHSDistrictData, district_rows, postgres)
+            timings["write"] = time.perf_counter() - write_started
+
+            refreshed = await refresh_derived(conn) if postgres else []
+    except _DryRun:
+        refreshed = []
+    finally:
+        await engine.dispose()
+
+    elapsed = time.perf_counter() - started
+    rows = len(state_rows) + len(district_rows)
+    return {
+        "round": args.round,
+        "nfhs_id": round_id,
+        "dry_run": args.dry_run,
+        "rows": {NFHSStateData.__tablename__: len(state_rows), NFHSDistrictData.__tablename__: len(district_rows)},
+        "refreshed_views": refreshed,
+        "seconds": {name: round(value, 3) for name, value in dict(timings, total=elapsed).items()},
+        "rows_per_second": round(rows / timings["write"]) if timings.get("write") else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load an NFHS round from factsheet CSV/Excel files")
+    parser.add_argument("files", nargs="+", help="CSV or .xlsx files")
+    parser.add_argument("--round", required=True, help='round name, e.g. "NFHS-6"; created if missing')
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL"),
+                        help="async SQLAlchemy URL (default: $DATABASE_URL)")
+    parser.add_argument("--replace", action="store_true", help="replace rows already loaded for this round")
+    parser.add_argument("--skip-unknown", action="store_true",
+                        help="drop rows whose region or indicator cannot be mapped instead of failing")
+    parser.add_argument("--dry-run", action="store_true", help="validate and map, then roll back")
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+
+    try:
+        report = asyncio.run(load_round(args))
+    except ValidationErrors as e:
+        for problem in e.problems[:50]:
+            print(problem)
+        if len(e.problems) > 50:
+            print(f"... and {len(e.problems) - 50} more")
+        raise SystemExit(f"Nothing loaded: {e}")
+
+    print(json.dumps(report, indent=2))
+    if not args.dry_run:
+        print(RELOAD_NOTICE, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
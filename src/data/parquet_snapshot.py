@@ -0,0 +1,191 @@
+"""Snapshot the NFHS tables to Parquet and load them back.
+
+    python -m src.data.parquet_snapshot export --database-url postgresql+asyncpg://... --output snapshots/nfhs
+    python -m src.data.parquet_snapshot import --database-url postgresql+asyncpg://... --input snapshots/nfhs --replace
+    python -m src.data.parquet_snapshot import --database-url sqlite+aiosqlite:///nfhs.sqlite3 --input snapshots/nfhs
+
+Every table of models.sqlalchemy_models becomes one zstd-compressed Parquet
+file. The id columns are int64 and the value columns stay strings, exactly
+as stored (including "NA"). A manifest.json records the row counts, which
+are checked again after an import.
+
+Imports into Postgres use asyncpg's binary COPY in batches inside one
+transaction, followed by ANALYZE. Other databases (the embedded SQLite file
+of storage_backend) get batched INSERTs, so a snapshot can also seed the
+embedded backend or a benchmark database in seconds. After an import it
+prints the loader's reminder about running API and dashboard workers.
+"""
+import argparse
+import asyncio
+import decimal
+import json
+import os
+import sys
+import time
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import NUMERIC, delete, func, insert, select, text
+from sqlalchemy.engine import make_url
+
+from models.sqlalchemy_models import Base
+from src.data.nfhs_loader import RELOAD_NOTICE
+from storage_backend import create_database_engine
+
+BATCH_SIZE = 50000
+MANIFEST = "manifest.json"
+
+
+def arrow_type(column):
+    # All NUMERIC columns of the schema hold integer ids
+    return pa.int64() if isinstance(column.type, NUMERIC) else pa.string()
+
+
+def arrow_schema(table):
+    return pa.schema([pa.field(column.name, arrow_type(column), nullable=not column.primary_key)
+                      for column in table.columns])
+
+
+def to_int(value):
+    return None if value is None else int(value)
+
+
+async def export_snapshot(database_url, output, batch_size=BATCH_SIZE):
+    os.makedirs(output, exist_ok=True)
+    engine = create_database_engine(database_url)
+    manifest = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "source": make_url(database_url).render_as_string(hide_password=True),
+        "tables": {},
+    }
+
+    try:
+        async with engine.connect() as conn:
+            for table in Base.metadata.sorted_tables:
+                schema = arrow_schema(table)
+                converters = [to_int if pa.types.is_integer(field.type) else None for field in schema]
+                path = os.path.join(output, f"{table.name}.parquet")
+                rows = 0
+
+                result = await conn.stream(select(table))
+                with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+                    async for batch in result.partitions(batch_size):
+                        columns = list(zip(*batch))
+                        arrays = [pa.array([convert(v) for v in values] if convert else values, type=field.type)
+                                  for values, convert, field in zip(columns, converters, schema)]
+                        writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+                        rows += len(batch)
+
+                manifest["tables"][table.name] = {"file": os.path.basename(path), "rows": rows}
+                print(f"  {table.name}: {rows} rows")
+    finally:
+        await engine.dispose()
+
+    with open(os.path.join(output, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def read_manifest(directory):
+    with open(os.path.join(directory, MANIFEST)) as f:
+        return json.load(f)
+
+
+def iter_records(path, batch_size, decimals):
+    """Yield lists of row tuples; NUMERIC columns as Decimal when loading through COPY."""
+    parquet = pq.ParquetFile(path)
+    for batch in parquet.iter_batches(batch_size=batch_size):
+        columns = []
+        for field, array in zip(batch.schema, batch.columns):
+            values = array.to_pylist()
+            if decimals and pa.types.is_integer(field.type):
+                values = [None if v is None else decimal.Decimal(v) for v in values]
+            columns.append(values)
+        yield batch.schema.names, list(zip(*columns))
+
+
+async def copy_tables(conn, tables, directory, manifest, batch_size):
+    """Load through asyncpg's binary COPY on the SQLAlchemy connection's driver connection."""
+    raw = (await conn.get_raw_connection()).driver_connection
+    for table in tables:
+        path = os.path.join(directory, manifest["tables"][table.name]["file"])
+        for names, records in iter_records(path, batch_size, decimals=True):
+            await raw.copy_records_to_table(table.name, records=records, columns=names)
+        await conn.execute(text(f'ANALYZE "{table.name}"'))
+
+
+async def insert_tables(conn, tables, directory, manifest, batch_size):
+    for table in tables:
+        path = os.path.join(directory, manifest["tables"][table.name]["file"])
+        for names, records in iter_records(path, batch_size, decimals=False):
+            await conn.execute(insert(table), [dict(zip(names, record)) for record in records])
+
+
+async def import_snapshot(database_url, directory, replace=False, batch_size=BATCH_SIZE):
+    manifest = read_manifest(directory)
+    tables = [t for t in Base.metadata.sorted_tables if t.name in manifest["tables"]]
+    engine = create_database_engine(database_url)
+    postgres = engine.dialect.name == "postgresql"
+    loaded = {}
+
+    try:
+        # One transaction: a failed import leaves the previous data in place
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            for table in reversed(tables):
+                existing = (await conn.execute(select(func.count()).select_from(table))).scalar()
+                if existing and not replace:
+                    raise SystemExit(f"{table.name} already has {existing} rows; use --replace")
+                if existing:
+                    await conn.execute(text(f'TRUNCATE "{table.name}"') if postgres else delete(table))
+
+            if postgres:
+                await copy_tables(conn, tables, directory, manifest, batch_size)
+            else:
+                await insert_tables(conn, tables, directory, manifest, batch_size)
+
+            for table in tables:
+                loaded[table.name] = (await conn.execute(select(func.count()).select_from(table))).scalar()
+                expected = manifest["tables"][table.name]["rows"]
+                if loaded[table.name] != expected:
+                    raise SystemExit(f"{table.name}: loaded {loaded[table.name]} rows, snapshot has {expected}")
+    finally:
+        await engine.dispose()
+    return loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export or import Parquet snapshots of the NFHS tables")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = sub.add_parser("export", help="write every table to <output>/<table>.parquet")
+    export_parser.add_argument("--output", required=True, help="snapshot directory")
+
+    import_parser = sub.add_parser("import", help="load a snapshot directory into a database")
+    import_parser.add_argument("--input", required=True, help="snapshot directory")
+    import_parser.add_argument("--replace", action="store_true", help="delete existing rows first")
+
+    for sub_parser in (export_parser, import_parser):
+        sub_parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL"),
+                                help="async SQLAlchemy URL (default: $DATABASE_URL)")
+        sub_parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+
+    started = time.perf_counter()
+    if args.command == "export":
+        manifest = asyncio.run(export_snapshot(args.database_url, args.output, args.batch_size))
+        rows = {name: info["rows"] for name, info in manifest["tables"].items()}
+    else:
+        rows = asyncio.run(import_snapshot(args.database_url, args.input, args.replace, args.batch_size))
+
+    elapsed = time.perf_counter() - started
+    print(json.dumps({"rows": rows, "seconds": round(elapsed, 2),
+                      "rows_per_second": round(sum(rows.values()) / elapsed) if elapsed else None}, indent=2))
+    if args.command == "import":
+        print(RELOAD_NOTICE, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""Generate a synthetic NFHS dataset for scale testing.
+
+    python -m src.data.synthetic_nfhs --database-url sqlite+aiosqlite:///synthetic_nfhs.db \\
+        --states 36 --districts 5000 --indicators 150 --rounds 3 --na-ratio 0.05 \\
+        --geojson-dir synthetic_geo --reset
+
+Fills States, Districts, Categories, Indicators, NFHS_Rounds, NFHS_State_Data
+and NFHS_District_Data through the same SQLAlchemy models the API uses, so
+any database the API can talk to (Postgres, or SQLite via aiosqlite) works.
+Without --database-url the data goes to a local synthetic_nfhs.db; the
+DATABASE_URL environment variable is ignored so --reset never drops the
+tables of the database the API is configured for.
+Values are stored as strings, with "NA" for missing entries, like the real
+data. District values scatter around their state, ST values trail non-ST
+values, and each round drifts a little from the previous one. The stored
+averages follow src.data.nfhs_loader: st_avg_total is the state's total and
+nat_avg_total the unweighted mean of the state totals.
+
+District ids start above the highest id in cluster_district_ids.json, so
+none of them is dropped by the API's blocked-district filter.
+
+With --geojson-dir, matching NFHS5_statefiles.geojson and
+NFHS5_districtlevel.geojson files are written with rectangular
+placeholder shapes. Set GEOJSON_DIR to that directory when starting the
+dashboard to render the maps.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import time
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from models.sqlalchemy_models import (
+    Base, Category, District, Indicator, NFHSDistrictData, NFHSRound, NFHSStateData, State
+)
+
+CATEGORY_NAMES = [
+    "Population and Household Profile",
+    "Marriage and Fertility",
+    "Maternal and Child Health",
+    "Child Vaccinations and Vitamin A Supplementation",
+    "Child Feeding Practices and Nutritional Status",
+    "Anaemia among Children and Adults",
+    "Women's Empowerment",
+    "Tobacco and Alcohol Use",
+]
+INDICATOR_TYPES = [(1, "Positive"), (2, "Negative"), (3, "Neutral")]
+
+# India's bounding box, used to lay out the synthetic shapes
+LON_RANGE = (68.0, 97.5)
+LAT_RANGE = (8.0, 37.0)
+
+BATCH_SIZE = 5000
+
+# The API drops these district ids from its responses (see fastapi_server)
+with open(os.path.join(os.path.dirname(__file__), "..", "..", "cluster_district_ids.json")) as f:
+    BLOCKED_DISTRICT_IDS = set(json.load(f))
+FIRST_DISTRICT_ID = max(BLOCKED_DISTRICT_IDS, default=0) + 1
+
+
+def state_acronym(index):
+    return chr(65 + index // 26 % 26) + chr(65 + index % 26)
+
+
+def fmt(value, na_ratio, rng):
+    return "NA" if rng.random() < na_ratio else f"{value:.1f}"
+
+
+def clamp(value):
+    return min(100.0, max(0.0, value))
+
+
+# === Reference tables ===
+def generate_reference(args, rng):
+    states = [
+        {"state_id": i + 1, "state_name": f"Synthetic State {i + 1:02d}", "state_acronym": state_acronym(i)}
+        for i in range(args.states)
+    ]
+
+    # Uneven district counts per state, at least one each
+    weights = [rng.uniform(0.3, 3.0) for _ in states]
+    total_weight = sum(weights)
+    counts = [max(1, round(args.districts * w / total_weight)) for w in weights]
+    districts = []
+    for state, count in zip(states, counts):
+        for n in range(count):
+            districts.append({
+                "district_id": FIRST_DISTRICT_ID + len(districts),
+                "state_id": state["state_id"],
+                "district_name": f"{state['state_name']} District {n + 1}"
+            })
+
+    categories = [
+        {"categories_id": i + 1, "categories": CATEGORY_NAMES[i] if i < len(CATEGORY_NAMES) else f"Category {i + 1}"}
+        for i in range(args.categories)
+    ]
+
+    indicators = []
+    for i in range(args.indicators):
+        type_id, type_name = rng.choice(INDICATOR_TYPES)
+        indicators.append({
+            "indicator_id": i + 1,
+            "indicator_name": f"Synthetic indicator {i + 1} (%)",
+            "indicator_type_id": type_id,
+            "indicator_type": type_name
+        })
+
+    rounds = [{"nfhs_id": r + 1, "nfhs_round": f"NFHS-{r + 1}"} for r in range(args.rounds)]
+
+    return {"states": states, "districts": districts, "categories": categories,
+            "indicators": indicators, "rounds": rounds}
+
+
+# === Indicator values ===
+def generate_values(args, rng, reference):
+    """Yield (model, rows) batches for the state and district data tables."""
+    states = reference["states"]
+    districts_by_state = {}
+    for district in reference["districts"]:
+        districts_by_state.setdefault(district["state_id"], []).append(district)
+
+    state_rows, district_rows = [], []
+    state_data_id = district_data_id = 0
+
+    for indicator in reference["indicators"]:
+        indicator_id = indicator["indicator_id"]
+        categories_id = (indicator_id - 1) % args.categories + 1
+        base = rng.uniform(10, 90)
+        spread = rng.uniform(4, 18)
+        st_gap = rng.uniform(0, 15)
+        trend = rng.uniform(-3, 5)
+
+        for rnd in reference["rounds"]:
+            nfhs_id = rnd["nfhs_id"]
+            drift = trend * (nfhs_id - 1)
+            state_means = {s["state_id"]: clamp(base + drift + rng.gauss(0, spread)) for s in states}
+            national = sum(state_means.values()) / len(state_means)
+
+            for state in states:
+                state_id = state["state_id"]
+                total = state_means[state_id]
+                st = clamp(total - st_gap + rng.gauss(0, 2))
+                state_data_id += 1
+                state_rows.append({
+                    "data_id": state_data_id,
+                    "state_id": state_id,
+                    "indicator_id": indicator_id,
+                    "categories_id": categories_id,
+                    "nfhs_id": nfhs_id,
+                    "st": fmt(st, args.na_ratio * 1.5, rng),
+                    "non_st": fmt(clamp(total + st_gap / 2 + rng.gauss(0, 2)), args.na_ratio, rng),
+                    "total": fmt(total, args.na_ratio, rng),
+                    "nat_avg_total": f"{national:.1f}"
+                })
+
+                for district in districts_by_state.get(state_id, []):
+                    d_total = clamp(total + rng.gauss(0, spread / 2))
+                    district_data_id += 1
+                    district_rows.append({
+                        "data_id": district_data_id,
+                        "state_id": state_id,
+                        "district_id": district["district_id"],
+                        "indicator_id": indicator_id,
+                        "categories_id": categories_id,
+                        "nfhs_id": nfhs_id,
+                        "st": fmt(clamp(d_total - st_gap + rng.gauss(0, 3)), args.na_ratio * 1.5, rng),
+                        "non_st": fmt(clamp(d_total + st_gap / 2 + rng.gauss(0, 3)), args.na_ratio, rng),
+                        "total": fmt(d_total, args.na_ratio, rng),
+                        "st_avg_total": f"{total:.1f}"
+                    })
+
+                    if len(district_rows) >= BATCH_SIZE:
+                        yield NFHSDistrictData, district_rows
+                        district_rows = []
+
+            if len(state_rows) >= BATCH_SIZE:
+                yield NFHSStateData, state_rows
+                state_rows = []
+
+    if state_rows:
+        yield NFHSStateData, state_rows
+    if district_rows:
+        yield NFHSDistrictData, district_rows
+
+
+# === GeoJSON ===
+def grid(count):
+    cols = max(1, math.ceil(math.sqrt(count)))
+    return cols, max(1, math.ceil(count / cols))
+
+
+def rectangle(lon0, lat0, lon1, lat1):
+    return {"type": "Polygon",
+            "coordinates": [[[lon0, lat0], [lon1, lat0], [lon1, lat1], [lon0, lat1], [lon0, lat0]]]}
+
+
+def synthetic_geojson(reference):
+    """State and district FeatureCollections tiling the map, districts nested in their state."""
+    states = reference["states"]
+    districts_by_state = {}
+    for district in reference["districts"]:
+        districts_by_state.setdefault(district["state_id"], []).append(district)
+
+    cols, rows = grid(len(states))
+    cell_w = (LON_RANGE[1] - LON_RANGE[0]) / cols
+    cell_h = (LAT_RANGE[1] - LAT_RANGE[0]) / rows
+
+    state_features, district_features = [], []
+    for i, state in enumerate(states):
+        lon0 = LON_RANGE[0] + (i % cols) * cell_w
+        lat0 = LAT_RANGE[0] + (i // cols) * cell_h
+        state_features.append({
+            "type": "Feature",
+            "properties": {"state_id": state["state_id"], "state_name": state["state_name"],
+                           "state_acronym": state["state_acronym"]},
+            "geometry": rectangle(lon0, lat0, lon0 + cell_w, lat0 + cell_h)
+        })
+
+        members = districts_by_state.get(state["state_id"], [])
+        d_cols, d_rows = grid(len(members))
+        d_w, d_h = cell_w / d_cols, cell_h / d_rows
+        for j, district in enumerate(members):
+            x = lon0 + (j % d_cols) * d_w
+            y = lat0 + (j // d_cols) * d_h
+            district_features.append({
+                "type": "Feature",
+                "properties": {"district_id": district["district_id"], "state_id": state["state_id"],
+                               "district_name": district["district_name"]},
+                "geometry": rectangle(round(x, 5), round(y, 5), round(x + d_w, 5), round(y + d_h, 5))
+            })
+
+    return ({"type": "FeatureCollection", "features": state_features},
+            {"type": "FeatureCollection", "features": district_features})
+
+
+def write_geojson(directory, reference):
+    os.makedirs(directory, exist_ok=True)
+    state_fc, district_fc = synthetic_geojson(reference)
+    for filename, collection in (("NFHS5_statefiles.geojson", state_fc),
+                                 ("NFHS5_districtlevel.geojson", district_fc)):
+        with open(os.path.join(directory, filename), "w", encoding="utf-8") as f:
+            json.dump(collection, f)
+
+
+# === Loading ===
+async def load(args):
+    rng = random.Random(args.seed)
+    reference = generate_reference(args, rng)
+    engine = create_async_engine(args.database_url)
+    started = time.perf_counter()
+    inserted = {}
+
+    try:
+        async with engine.begin() as conn:
+            if args.reset:
+                await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+            existing = (await conn.execute(select(func.count()).select_from(State))).scalar()
+            if existing:
+                raise SystemExit(f"{existing} states already present; use --reset to replace the data")
+
+            for model, rows in ((State, reference["states"]), (District, reference["districts"]),
+                                (Category, reference["categories"]), (Indicator, reference["indicators"]),
+                                (NFHSRound, reference["rounds"])):
+                await conn.execute(insert(model.__table__), rows)
+                inserted[model.__tablename__] = len(rows)
+
+            for model, rows in generate_values(args, rng, reference):
+                await conn.execute(insert(model.__table__), rows)
+                inserted[model.__tablename__] = inserted.get(model.__tablename__, 0) + len(rows)
+    finally:
+        await engine.dispose()
+
+    if args.geojson_dir:
+        write_geojson(args.geojson_dir, reference)
+
+    elapsed = time.perf_counter() - started
+    total = sum(inserted.values())
+    print(json.dumps({"rows": inserted, "seconds": round(elapsed, 2),
+                      "rows_per_second": round(total / elapsed) if elapsed else None}, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic NFHS dataset for scale testing")
+    # Deliberately not read from $DATABASE_URL: --reset drops every table
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///synthetic_nfhs.db",
+                        help="async SQLAlchemy URL (postgresql+asyncpg://... or sqlite+aiosqlite:///...); "
+                             "defaults to a local synthetic_nfhs.db")
+    parser.add_argument("--states", type=int, default=36)
+    parser.add_argument("--districts", type=int, default=700)
+    parser.add_argument("--indicators", type=int, default=130)
+    parser.add_argument("--categories", type=int, default=len(CATEGORY_NAMES))
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--na-ratio", type=float, default=0.05, help="share of values stored as 'NA'")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--geojson-dir", help="also write matching synthetic GeoJSON files here")
+    parser.add_argument("--reset", action="store_true", help="drop and recreate the tables first")
+    args = parser.parse_args()
+
+    asyncio.run(load(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Non-blocking structured logging for the API and the Dash server.
+
+``configure_logging()`` installs a QueueHandler on the root logger. Request
+code only enqueues records; a QueueListener thread formats them and writes
+them to stderr. Configuration comes from the environment:
+
+    LOG_LEVEL=INFO                                      root level
+    LOG_LEVELS=fastapi_server=DEBUG,sqlalchemy=WARNING  per-logger levels
+    LOG_FORMAT=json                                     json (default) or text
+    LOG_PAYLOAD_SAMPLE_RATE=0.01                        share of payload records kept
+    LOG_PAYLOAD_MAX_CHARS=2000                          longer payload strings are cut
+
+Verbose data (prompts, raw LLM output) goes in ``extra={"payload": ...}``.
+Those records are sampled before anything is formatted, so most never reach
+the queue.
+"""
+import atexit
+import copy
+import datetime
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener = None
+_listener_handlers = ()
+_queue_handler = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, message, then any ``extra`` fields."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class PayloadSampler(logging.Filter):
+    """Keep only a sample of records carrying a ``payload`` and cap the size of the ones kept."""
+
+    def __init__(self, rate: float = 0.01, max_chars: int = 2000):
+        super().__init__()
+        self.rate = rate
+        self.max_chars = max_chars
+
+    def filter(self, record):
+        payload = getattr(record, "payload", None)
+        if payload is None:
+            return True
+        if self.rate < 1 and random.random() >= self.rate:
+            return False
+        record.payload = self._truncate(payload)
+        return True
+
+    def _truncate(self, value):
+        if isinstance(value, str) and len(value) > self.max_chars:
+            return value[:self.max_chars] + f"... [{len(value) - self.max_chars} more chars]"
+        if isinstance(value, dict):
+            return {k: self._truncate(v) for k, v in value.items()}
+        return value
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        # Merge args and render the traceback now (they may not survive the hop to
+        # the listener thread) but leave the JSON formatting to the listener
+        record = copy.copy(record)
+        record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def parse_levels(spec: str):
+    """``"a=DEBUG,b.c=WARNING"`` -> {"a": "DEBUG", "b.c": "WARNING"}"""
+    levels = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, level = item.partition("=")
+        if level:
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def _start_listener(handler):
+    global _listener
+    _listener = logging.handlers.QueueListener(handler.queue, *_listener_handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def _restart_after_fork():
+    # gunicorn forks workers from a preloaded master; the listener thread does not survive the fork
+    if _queue_handler is not None:
+        _queue_handler.queue = queue.SimpleQueue()
+        _start_listener(_queue_handler)
+
+
+def _stop_listener():
+    if _listener is not None:
+        _listener.stop()
+
+
+def configure_logging():
+    """Route all logging through a background thread; safe to call more than once."""
+    global _queue_handler, _listener_handlers
+    if _queue_handler is not None:
+        return
+
+    output = logging.StreamHandler(sys.stderr)
+    if os.environ.get("LOG_FORMAT", "json").lower() == "text":
+        output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    else:
+        output.setFormatter(JsonFormatter())
+    _listener_handlers = (output,)
+
+    _queue_handler = _QueueHandler(queue.SimpleQueue())
+    _queue_handler.addFilter(PayloadSampler(
+        rate=float(os.environ.get("LOG_PAYLOAD_SAMPLE_RATE", 0.01)),
+        max_chars=int(os.environ.get("LOG_PAYLOAD_MAX_CHARS", 2000)),
+    ))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
+    for name, level in parse_levels(os.environ.get("LOG_LEVELS", "")).items():
+        logging.getLogger(name).setLevel(level)
+
+    _start_listener(_queue_handler)
+    atexit.register(_stop_listener)
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_restart_after_fork)